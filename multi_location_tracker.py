@@ -9,17 +9,110 @@ import json
 import os
 import sqlite3
 import glob
+import bisect
+import functools
 import math
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from secure_database import SecureKismetDB
 
+# Try numpy for vectorized distance math, fall back to scalar haversine
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# Try orjson for faster JSON parse/serialize (device blobs + data file)
+try:
+    import orjson
+    HAS_ORJSON = True
+    _json_loads = orjson.loads
+except ImportError:
+    HAS_ORJSON = False
+    _json_loads = json.loads
+
+# Try rich for the pretty report table
+try:
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+    HAS_RICH = True
+except ImportError:
+    HAS_RICH = False
+
+
+# Conservative bound on sqlite host parameters (SQLITE_MAX_VARIABLE_NUMBER
+# was 999 before sqlite 3.32); the device query leaves one slot for the
+# last_time cutoff of an incremental scan
+_SQL_MAX_PARAMS = 999
+
+
+# ──────────────────────────────────────────────
+#  Kismet device blob helpers
+# ──────────────────────────────────────────────
+_SSID_MAP_KEYS = ("dot11.device.probed_ssid_map", "dot11.device.advertised_ssid_map")
+
+
+def _parse_device_blob(device) -> tuple[str, tuple]:
+    """Extract (manufacturer, ssids) from a Kismet `device` JSON blob."""
+    ssids = []
+    try:
+        blob = _json_loads(device)
+        for key in _SSID_MAP_KEYS:
+            mp = blob.get("dot11.device", {}).get(key, {})
+            if isinstance(mp, dict):
+                for v in mp.values():
+                    s = (v.get("dot11.probedssid.ssid")
+                         or v.get("dot11.advertisedssid.ssid", ""))
+                    if s and s not in ssids:
+                        ssids.append(s)
+        mfr = blob.get("kismet.device.base.manuf", "Unknown")
+    except Exception:
+        mfr = "Unknown"
+    return mfr, tuple(ssids)
+
+
+@functools.lru_cache(maxsize=4096)
+def _iso(ts) -> str:
+    """
+    Same as datetime.fromtimestamp(ts).isoformat() (local time), formatted
+    straight from time.localtime for the whole-second stamps Kismet stores.
+    Cached since a device's last_time repeats across rows and sweeps.
+    """
+    if ts != int(ts):
+        return datetime.fromtimestamp(ts).isoformat()
+    tm = time.localtime(ts)
+    return (f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+            f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}")
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _naive_ts(value) -> float:
+    """Seconds from a naive epoch for a naive datetime or ISO string; NaN if unparseable."""
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        return (value - _EPOCH).total_seconds()
+    except Exception:
+        return math.nan
+
 
 # ──────────────────────────────────────────────
 #  GPS helpers
 # ──────────────────────────────────────────────
+# Great-circle km per degree of latitude (haversine R = 6371 km)
+_KM_PER_DEG_LAT = 6371.0 * math.pi / 180
+
 def haversine_km(lat1, lon1, lat2, lon2) -> float:
     """Return distance in km between two GPS coordinates."""
     R = 6371.0
@@ -30,6 +123,26 @@ def haversine_km(lat1, lon1, lat2, lon2) -> float:
     return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
+def _haversine_rad(phi1, lam1, cos_phi1, phi2, lam2, cos_phi2) -> float:
+    """Scalar haversine on precomputed radians/cosines."""
+    R = 6371.0
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + cos_phi1 * cos_phi2 * math.sin((lam2 - lam1) / 2) ** 2)
+    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def haversine_matrix(lat_arr, lon_arr, cp_lat_arr, cp_lon_arr):
+    """
+    Pairwise haversine via broadcasting: (N, M) km matrix from N points to
+    M points. All four inputs are numpy arrays in radians.
+    """
+    R = 6371.0
+    phi1, lam1 = lat_arr[:, None], lon_arr[:, None]
+    a = (np.sin((cp_lat_arr - phi1) / 2) ** 2
+         + np.cos(phi1) * np.cos(cp_lat_arr) * np.sin((cp_lon_arr - lam1) / 2) ** 2)
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
 @dataclass
 class GPSCheckpoint:
     timestamp: str           # ISO timestamp of when we were at this location
@@ -61,7 +174,7 @@ class StalkerProfile:
     mac: str
     label: str = ""
     manufacturer: str = ""
-    ssids: list = field(default_factory=list)
+    ssids: set = field(default_factory=set)
     # All unique GPS checkpoint locations this device was seen at
     locations_seen: list = field(default_factory=list)   # list of dict {lat,lon,label,timestamp}
     unique_location_count: int = 0
@@ -73,7 +186,219 @@ class StalkerProfile:
     notes: str = ""
 
     def to_dict(self):
-        return asdict(self)
+        d = asdict(self)
+        d["ssids"] = sorted(self.ssids)
+        return d
+
+
+def _profile_to_jsonable(p: StalkerProfile) -> dict:
+    """Plain-dict view of a profile for save(); no deep copy, json only reads it."""
+    return {
+        "mac": p.mac,
+        "label": p.label,
+        "manufacturer": p.manufacturer,
+        "ssids": sorted(p.ssids),
+        "locations_seen": p.locations_seen,
+        "unique_location_count": p.unique_location_count,
+        "total_hits": p.total_hits,
+        "stalker_score": p.stalker_score,
+        "first_seen": p.first_seen,
+        "last_seen": p.last_seen,
+        "notes": p.notes,
+    }
+
+
+def _checkpoint_to_jsonable(cp: GPSCheckpoint) -> dict:
+    return {
+        "timestamp": cp.timestamp,
+        "lat": cp.lat,
+        "lon": cp.lon,
+        "location_label": cp.location_label,
+    }
+
+
+# ──────────────────────────────────────────────
+#  Per-DB scan (in-process or in a worker)
+# ──────────────────────────────────────────────
+class _DBScan:
+    """
+    Read-only snapshot of what scanning one Kismet DB needs. Calling it
+    returns (hits, parsed) instead of touching profiles, so it can be
+    pickled into worker processes and merged by the tracker in order.
+
+    hits:   (mac, lat, lon, checkpoint index, first_time, last_time, signal,
+             (manufacturer, ssids) or None when the tracker's cached parse applies)
+    parsed: mac → (last_time, manufacturer, ssids) for blobs parsed here
+    """
+
+    def __init__(self, checkpoints: list[GPSCheckpoint], max_km: float,
+                 query: tuple[str, tuple], skip_macs: set, parsed_at: dict):
+        self.checkpoints = checkpoints
+        self.max_km = max_km
+        self.query = query
+        self.skip_macs = skip_macs
+        # mac → last_time of the tracker's cached parse
+        self.parsed_at = parsed_at
+        # Checkpoint lat/lon in radians for vectorized nearest-checkpoint lookup
+        if HAS_NUMPY:
+            self.cp_lat_arr = np.radians([cp.lat for cp in checkpoints])
+            self.cp_lon_arr = np.radians([cp.lon for cp in checkpoints])
+        # Checkpoint indexes sorted by latitude, for the scalar bisect scan
+        self.cp_by_lat = sorted(range(len(checkpoints)), key=lambda i: checkpoints[i].lat)
+        self.cp_lats = [checkpoints[i].lat for i in self.cp_by_lat]
+
+    def __call__(self, db_path: str, since: Optional[tuple] = None) -> tuple[list, dict, Optional[float], list]:
+        """
+        🔒 Secure: parameterized SecureKismetDB — no raw SQL concatenation.
+        since: (high_water, boundary MACs) from an earlier scan — only rows with
+        last_time >= high_water are read, minus the boundary MACs already counted at it.
+        Returns (hits, parsed, this DB's max last_time or None if the scan failed,
+        MACs counted at that max).
+        """
+        hits, parsed = [], {}
+        cutoff, seen = since if since is not None else (None, ())
+        seen = set(seen)
+        try:
+            with SecureKismetDB(db_path) as db:
+                if not db.validate_connection():
+                    return hits, parsed, None, []
+                sql, params = self.query
+                if cutoff is not None:
+                    # last_time is whole seconds: Kismet can still write rows into
+                    # the high-water second after we read it, so reread that second
+                    sql, params = sql + " AND last_time >= ?", params + (cutoff,)
+                # One snapshot for the row and blob queries: Kismet re-writing a
+                # device mid-scan would otherwise give its blob a new rowid
+                with db.read_transaction():
+                    high_water = db.execute_safe_query("SELECT MAX(last_time) AS t FROM devices")[0]["t"]
+                    boundary = set()
+                    # Stream rows in chunks so large DBs never fully materialize
+                    for rows in db.execute_safe_query_iter(sql, params):
+                        if seen:
+                            rows = [r for r in rows if r["last_time"] != cutoff or r["devmac"] not in seen]
+                        boundary.update(r["devmac"] for r in rows if r["last_time"] == high_water)
+                        self._scan_rows(db, rows, hits, parsed)
+        except Exception as e:
+            print(f"[MLT] DB error {db_path}: {e}")
+            return hits, parsed, None, []
+        if high_water is not None and high_water == cutoff:
+            boundary |= seen
+        return hits, parsed, high_water, sorted(boundary)
+
+    def _scan_rows(self, db: SecureKismetDB, rows: list, hits: list, parsed: dict):
+        candidates = []
+        for row in rows:
+            # Still checked here for skip lists too large to inline in SQL
+            if row["devmac"] in self.skip_macs:
+                continue
+            lat, lon = row["avg_lat"] or 0.0, row["avg_lon"] or 0.0
+            if lat == 0.0 and lon == 0.0:
+                continue
+            candidates.append((row, lat, lon))
+
+        # Find nearest user checkpoint for every candidate in one batch
+        nearest = self.nearest_checkpoints([(lat, lon) for _, lat, lon in candidates])
+        gated = []
+        for (row, lat, lon), (cp_idx, dist) in zip(candidates, nearest):
+            # Only count if within 1km of one of our checkpoints
+            if cp_idx is not None and dist <= self.max_km:
+                gated.append((row, lat, lon, cp_idx))
+
+        # Device blobs are only fetched/parsed for rows that passed the gate
+        details = self._device_details(db, [row for row, *_ in gated], parsed)
+        for row, lat, lon, cp_idx in gated:
+            hits.append((row["devmac"], lat, lon, cp_idx, row["first_time"],
+                         row["last_time"], row["strongest_signal"], details.get(row["rowid"])))
+
+    def _device_details(self, db: SecureKismetDB, rows: list, parsed: dict) -> dict[int, tuple[str, tuple]]:
+        """
+        Map rowid → (manufacturer, ssids) for rows whose MAC's Kismet record
+        (last_time) changed since the tracker last parsed it. Rows left out
+        reuse the tracker's cached parse.
+        """
+        details, missing = {}, {}
+        for row in rows:
+            if self.parsed_at.get(row["devmac"]) != row["last_time"]:
+                missing[row["rowid"]] = row
+
+        rowids = list(missing)
+        for i in range(0, len(rowids), _SQL_MAX_PARAMS):
+            batch = rowids[i:i + _SQL_MAX_PARAMS]
+            blobs = db.execute_safe_query(
+                "SELECT rowid, device FROM devices WHERE rowid IN ({})".format(",".join("?" * len(batch))),
+                tuple(batch)
+            )
+            for b in blobs:
+                row = missing[b["rowid"]]
+                mfr, ssids = _parse_device_blob(b["device"])
+                parsed[row["devmac"]] = (row["last_time"], mfr, ssids)
+                details[b["rowid"]] = (mfr, ssids)
+        return details
+
+    def nearest_checkpoint(self, lat: float, lon: float) -> tuple[Optional[int], float]:
+        """Return (index of nearest checkpoint, distance in km), or (None, inf) with no checkpoints."""
+        if not self.checkpoints:
+            return None, math.inf
+        # Walk outward from the closest latitude; |Δlat| alone is a lower
+        # bound on the distance, so each side stops once it exceeds the best.
+        cps, order = self.checkpoints, self.cp_by_lat
+        best_idx, best = None, math.inf
+        hi = bisect.bisect_left(self.cp_lats, lat)
+        lo = hi - 1
+        while lo >= 0 or hi < len(order):
+            for side in (lo, hi):
+                if 0 <= side < len(order):
+                    i = order[side]
+                    d = haversine_km(lat, lon, cps[i].lat, cps[i].lon)
+                    # Ties go to the earlier-added checkpoint
+                    if d < best or (d == best and i < best_idx):
+                        best_idx, best = i, d
+            if lo >= 0 and abs(lat - self.cp_lats[lo]) * _KM_PER_DEG_LAT > best:
+                lo = -1
+            else:
+                lo -= 1
+            if hi < len(order) and abs(self.cp_lats[hi] - lat) * _KM_PER_DEG_LAT > best:
+                hi = len(order)
+            else:
+                hi += 1
+        return best_idx, best
+
+    def nearest_checkpoints(self, points: list[tuple[float, float]]) -> list[tuple[Optional[int], float]]:
+        """Batch form of nearest_checkpoint over a list of (lat, lon) points."""
+        if not HAS_NUMPY or not points or not self.checkpoints:
+            return [self.nearest_checkpoint(lat, lon) for lat, lon in points]
+        pts = np.radians(np.asarray(points, dtype=float))
+        dists = haversine_matrix(pts[:, 0], pts[:, 1], self.cp_lat_arr, self.cp_lon_arr)
+        idxs = dists.argmin(axis=1)
+        best = dists[np.arange(len(idxs)), idxs]
+        return list(zip(idxs.tolist(), best.tolist()))
+
+
+def _db_stamp(db_path: str) -> list:
+    """[size, mtime_ns] of a Kismet DB, plus its -wal sidecar's if present (writes may only touch that)."""
+    stamp = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamp += [st.st_size, st.st_mtime_ns]
+    return stamp
+
+
+def _glob_files(pattern: str) -> list[str]:
+    """glob.glob for log paths; `<dir>/*<suffix>` is served by one os.scandir pass."""
+    dirname, base = os.path.split(pattern)
+    suffix = base[1:]
+    if not base.startswith("*") or glob.has_magic(dirname) or glob.has_magic(suffix):
+        return glob.glob(pattern)
+    try:
+        with os.scandir(dirname or os.curdir) as it:
+            # Same matches as glob (no dotfiles), minus directories
+            return [os.path.join(dirname, e.name) for e in it
+                    if e.name.endswith(suffix) and not e.name.startswith(".") and e.is_file()]
+    except OSError:
+        return []
 
 
 # ──────────────────────────────────────────────
@@ -81,7 +406,8 @@ class StalkerProfile:
 # ──────────────────────────────────────────────
 class MultiLocationTracker:
     def __init__(self, config_path: str = "config.json",
-                 data_path: str = "data/multi_location.json"):
+                 data_path: str = "data/multi_location.json",
+                 max_workers: Optional[int] = None):
         with open(config_path) as f:
             self.config = json.load(f)
         self.data_path = data_path
@@ -93,6 +419,20 @@ class MultiLocationTracker:
         self.our_checkpoints: list[GPSCheckpoint] = []
         # Minimum km between two checkpoints to count as "different location"
         self.min_location_separation_km = 0.5
+        # Devices only count when within this many km of one of our checkpoints
+        self.max_checkpoint_distance_km = 1.0
+        # mac → (last_time, manufacturer, ssids) from the last parsed device blob
+        self._parse_cache: dict[str, tuple[int, str, tuple]] = {}
+        # mac → {grid cell: [(phi, lambda, cos phi), ...]} of that device's locations_seen.
+        # Cells are slightly wider (in degrees latitude) than the separation radius.
+        self._loc_cells: dict[str, dict] = {}
+        self._cell_deg = self.min_location_separation_km / 111.0
+        # Worker processes for multi-DB scans (None → one per CPU, 1 → in-process)
+        self.max_workers = max_workers
+        # What earlier scans covered, saved with the profiles:
+        # {"scope": checkpoint geometry,
+        #  "dbs": {db_path: [file stamp, max last_time, MACs counted at that second]}}
+        self._scan_state: dict = {}
 
         self._load()
 
@@ -100,25 +440,32 @@ class MultiLocationTracker:
     def _load(self):
         if os.path.exists(self.data_path):
             try:
-                with open(self.data_path) as f:
-                    raw = json.load(f)
+                raw = _json_loads(Path(self.data_path).read_bytes())
                 for mac, d in raw.get("profiles", {}).items():
-                    self.profiles[mac] = StalkerProfile(**{
+                    p = StalkerProfile(**{
                         k: v for k, v in d.items()
                         if k in StalkerProfile.__dataclass_fields__
                     })
+                    p.ssids = set(p.ssids)
+                    self.profiles[mac] = p
                 for cp in raw.get("our_checkpoints", []):
                     self.our_checkpoints.append(GPSCheckpoint(**cp))
+                self._scan_state = raw.get("scan_state", {})
             except Exception as e:
                 print(f"[MLT] Load error: {e}")
 
     def save(self):
-        with open(self.data_path, "w") as f:
-            json.dump({
-                "profiles": {mac: p.to_dict() for mac, p in self.profiles.items()},
-                "our_checkpoints": [cp.to_dict() for cp in self.our_checkpoints],
-                "updated": datetime.now().isoformat(),
-            }, f, indent=2)
+        payload = {
+            "profiles": {mac: _profile_to_jsonable(p) for mac, p in self.profiles.items()},
+            "our_checkpoints": [_checkpoint_to_jsonable(cp) for cp in self.our_checkpoints],
+            "scan_state": self._scan_state,
+            "updated": datetime.now().isoformat(),
+        }
+        if HAS_ORJSON:
+            Path(self.data_path).write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.data_path, "w") as f:
+                json.dump(payload, f, indent=2)
 
     def add_checkpoint(self, lat: float, lon: float, label: str = ""):
         """Record our current GPS location as a named checkpoint."""
@@ -134,19 +481,65 @@ class MultiLocationTracker:
 
     def _is_new_location(self, mac: str, lat: float, lon: float) -> bool:
         """True if this lat/lon is far enough from all previously recorded locations for this device."""
-        if mac not in self.profiles:
+        if mac not in self.profiles or not self.profiles[mac].locations_seen:
             return True
-        for loc in self.profiles[mac].locations_seen:
-            dist = haversine_km(lat, lon, loc["lat"], loc["lon"])
-            if dist < self.min_location_separation_km:
+        phi, lam = math.radians(lat), math.radians(lon)
+        cos_phi = math.cos(phi)
+        for loc in self._nearby_locations(mac, lat, lon):
+            if _haversine_rad(phi, lam, cos_phi, *loc) < self.min_location_separation_km:
                 return False
         return True
 
+    def _nearby_locations(self, mac: str, lat: float, lon: float):
+        """
+        Yield (phi, lambda, cos phi) of the device's stored locations in grid
+        cells that could lie within min_location_separation_km of lat/lon.
+        Cells are _cell_deg wide, so one row either side covers latitude and
+        the column span is widened by 1/cos(lat) for longitude.
+        """
+        cells = self._location_cells(mac)
+        d = self._cell_deg
+        cos_lat = math.cos(math.radians(min(abs(lat) + d, 90.0)))
+        dlon = d / cos_lat if cos_lat > 1e-6 else 360.0
+        if lon - dlon < -180.0 or lon + dlon > 180.0:
+            # Near a pole or the antimeridian — grid columns don't wrap, check everything
+            for bucket in cells.values():
+                yield from bucket
+            return
+        row, col = math.floor(lat / d), math.floor(lon / d)
+        span = math.ceil(dlon / d)
+        for r in (row - 1, row, row + 1):
+            for c in range(col - span, col + span + 1):
+                yield from cells.get((r, c), ())
+
+    def _location_cells(self, mac: str) -> dict:
+        """Grid cell → precomputed radians of a device's locations_seen. Built on first use."""
+        cells = self._loc_cells.get(mac)
+        if cells is None:
+            cells = self._loc_cells[mac] = {}
+            for loc in self.profiles[mac].locations_seen:
+                self._add_to_cells(cells, loc)
+        return cells
+
+    def _add_to_cells(self, cells: dict, loc: dict):
+        d = self._cell_deg
+        key = (math.floor(loc["lat"] / d), math.floor(loc["lon"] / d))
+        phi = math.radians(loc["lat"])
+        cells.setdefault(key, []).append((phi, math.radians(loc["lon"]), math.cos(phi)))
+
+    def _record_location(self, p: StalkerProfile, loc: dict):
+        """Append a new unique location and keep the grid index in step."""
+        p.locations_seen.append(loc)
+        p.unique_location_count = len(p.locations_seen)
+        cells = self._loc_cells.get(p.mac)
+        if cells is not None:
+            self._add_to_cells(cells, loc)
+
     # ─── Kismet DB scan ───────────────────────
     def _get_kismet_files(self) -> list[str]:
-        files = glob.glob(self.config["paths"]["kismet_logs"])
+        files = _glob_files(self.config["paths"]["kismet_logs"])
         if not files:
-            files = glob.glob(os.path.join(str(Path.home()), "*.kismet"))
+            files = _glob_files(os.path.join(str(Path.home()), "*.kismet"))
         return sorted(files)
 
     def scan_and_correlate(self, whitelist_path: str = "data/home_whitelist.json"):
@@ -168,90 +561,120 @@ class MultiLocationTracker:
         except Exception:
             pass
 
+        # Skip DBs unchanged since the last scan and only read rows Kismet has
+        # updated since then from the rest; a checkpoint change rescans everything
+        scope = self._scan_scope()
+        prev = self._scan_state.get("dbs", {}) if self._scan_state.get("scope") == scope else {}
+        dbs, files, since = {}, [], []
         for db_path in self._get_kismet_files():
-            self._process_db(db_path, home_macs)
+            stamp = _db_stamp(db_path)
+            old = prev.get(db_path)
+            if old and old[0] == stamp:
+                dbs[db_path] = old
+                continue
+            files.append(db_path)
+            # A shrunk DB was replaced or rewritten, so read it all again
+            since.append(old[1:] if old and stamp[:1] >= old[0][:1] else None)
+            dbs[db_path] = [stamp, None, []]
+
+        # Parses cached before this scan; workers skip blobs for these MACs
+        cached = dict(self._parse_cache)
+        scan = _DBScan(self.our_checkpoints, self.max_checkpoint_distance_km,
+                       self._build_device_query(home_macs), home_macs,
+                       {mac: c[0] for mac, c in cached.items()})
+        for db_path, (hits, parsed, high_water, boundary) in zip(files, self._run_scans(scan, files, since)):
+            self._merge(hits, parsed, cached)
+            if high_water is None:
+                del dbs[db_path]  # failed or empty — scan it in full next time
+            else:
+                dbs[db_path][1:] = high_water, boundary
+        self._scan_state = {"scope": scope, "dbs": dbs}
 
         self._compute_scores()
         self.save()
         return self.get_ranked_stalkers()
 
-    def _process_db(self, db_path: str, skip_macs: set):
-        """🔒 Secure: parameterized SecureKismetDB — no raw SQL concatenation."""
-        try:
-            with SecureKismetDB(db_path) as db:
-                if not db.validate_connection():
-                    return
-                rows = db.execute_safe_query(
-                    "SELECT devmac, device, first_time, last_time, "
-                    "avg_lat, avg_lon, strongest_signal "
-                    "FROM devices WHERE avg_lat != 0 AND avg_lon != 0"
+    def _build_device_query(self, skip_macs: set) -> tuple[str, tuple]:
+        """
+        Parameterized device SELECT that lets sqlite drop rows outside a
+        bounding box around each checkpoint, plus whitelisted MACs, before
+        they ever reach Python. The exact haversine check still runs after.
+        """
+        clauses, params = [], []
+        dlat = self.max_checkpoint_distance_km / 111.0
+        for cp in self.our_checkpoints:
+            cos_lat = math.cos(math.radians(min(abs(cp.lat) + dlat, 90.0)))
+            dlon = dlat / cos_lat if cos_lat > 1e-6 else 360.0
+            if cp.lon - dlon < -180.0 or cp.lon + dlon > 180.0:
+                # Box wraps the antimeridian or a pole — filter on latitude only
+                clauses.append("(avg_lat BETWEEN ? AND ?)")
+                params += [cp.lat - dlat, cp.lat + dlat]
+            else:
+                clauses.append("(avg_lat BETWEEN ? AND ? AND avg_lon BETWEEN ? AND ?)")
+                params += [cp.lat - dlat, cp.lat + dlat, cp.lon - dlon, cp.lon + dlon]
+
+        sql = ("SELECT rowid, devmac, first_time, last_time, "
+               "avg_lat, avg_lon, strongest_signal "
+               "FROM devices WHERE avg_lat != 0 AND avg_lon != 0")
+        limit = _SQL_MAX_PARAMS - 1
+        if clauses and len(params) <= limit:
+            sql += " AND (" + " OR ".join(clauses) + ")"
+        else:
+            params = []
+        if skip_macs and len(params) + len(skip_macs) <= limit:
+            sql += " AND devmac NOT IN ({})".format(",".join("?" * len(skip_macs)))
+            params += sorted(skip_macs)
+        return sql, tuple(params)
+
+    def _scan_scope(self) -> list:
+        """What a DB's scan results depend on besides its rows; saved scan state is only reused while it matches."""
+        return [self.max_checkpoint_distance_km,
+                [[cp.lat, cp.lon] for cp in self.our_checkpoints]]
+
+    def _run_scans(self, scan: "_DBScan", files: list[str],
+                   since: list[Optional[list]]) -> list[tuple[list, dict, Optional[float], list]]:
+        """Run `scan` over every DB (from its `since` cutoff) — in a process pool when there are several — in file order."""
+        workers = min(len(files), self.max_workers or os.cpu_count() or 1)
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as ex:
+                    return list(ex.map(scan, files, since))
+            except (OSError, BrokenProcessPool, pickle.PicklingError) as e:
+                print(f"[MLT] Parallel scan unavailable ({e}); scanning sequentially")
+        return [scan(db_path, s) for db_path, s in zip(files, since)]
+
+    def _merge(self, hits: list, parsed: dict, cached: dict):
+        """Apply one DB's scan results to the profiles, in row order."""
+        self._parse_cache.update(parsed)
+        cps = self.our_checkpoints
+        for mac, lat, lon, cp_idx, first_time, last_time, signal, details in hits:
+            if details is None:
+                if mac not in cached:
+                    continue  # blob row vanished between queries; picked up next scan
+                details = cached[mac][1:]
+            mfr, ssids = details
+
+            ts_last = _iso(last_time) if last_time else ""
+            ts_first = _iso(first_time) if first_time else ""
+
+            if mac not in self.profiles:
+                self.profiles[mac] = StalkerProfile(
+                    mac=mac, manufacturer=mfr, ssids=set(ssids),
+                    first_seen=ts_first, last_seen=ts_last
                 )
-            for row in rows:
-                mac = row["devmac"]
-                if mac in skip_macs:
-                    continue
-                lat, lon = row["avg_lat"] or 0.0, row["avg_lon"] or 0.0
-                if lat == 0.0 and lon == 0.0:
-                    continue
-
-                # Find nearest user checkpoint
-                nearest_cp = self._nearest_checkpoint(lat, lon)
-                if nearest_cp is None:
-                    continue
-
-                dist = haversine_km(lat, lon, nearest_cp.lat, nearest_cp.lon)
-                # Only count if within 1km of one of our checkpoints
-                if dist > 1.0:
-                    continue
-
-                # Parse SSIDs from device blob
-                ssids = []
-                try:
-                    blob = json.loads(row["device"])
-                    for key in ["dot11.device.probed_ssid_map", "dot11.device.advertised_ssid_map"]:
-                        mp = blob.get("dot11.device", {}).get(key, {})
-                        if isinstance(mp, dict):
-                            for v in mp.values():
-                                s = (v.get("dot11.probedssid.ssid")
-                                     or v.get("dot11.advertisedssid.ssid", ""))
-                                if s and s not in ssids:
-                                    ssids.append(s)
-                    mfr = blob.get("kismet.device.base.manuf", "Unknown")
-                except Exception:
-                    mfr = "Unknown"
-
-                ts_last = datetime.fromtimestamp(row["last_time"]).isoformat() if row["last_time"] else ""
-                ts_first = datetime.fromtimestamp(row["first_time"]).isoformat() if row["first_time"] else ""
-
-                if mac not in self.profiles:
-                    self.profiles[mac] = StalkerProfile(
-                        mac=mac, manufacturer=mfr, ssids=ssids,
-                        first_seen=ts_first, last_seen=ts_last
-                    )
-                p = self.profiles[mac]
-                p.total_hits += 1
-                p.last_seen = ts_last
-                for s in ssids:
-                    if s and s not in p.ssids:
-                        p.ssids.append(s)
-
-                # Record new unique location
-                if self._is_new_location(mac, lat, lon):
-                    p.locations_seen.append({
-                        "lat": lat, "lon": lon,
-                        "label": nearest_cp.location_label,
-                        "timestamp": ts_last,
-                        "signal": row["strongest_signal"],
-                    })
-                    p.unique_location_count = len(p.locations_seen)
-        except Exception as e:
-            print(f"[MLT] DB error {db_path}: {e}")
-
-    def _nearest_checkpoint(self, lat: float, lon: float) -> Optional[GPSCheckpoint]:
-        if not self.our_checkpoints:
-            return None
-        return min(self.our_checkpoints,
-                   key=lambda cp: haversine_km(lat, lon, cp.lat, cp.lon))
+            p = self.profiles[mac]
+            p.total_hits += 1
+            p.last_seen = ts_last
+            p.ssids.update(ssids)
+
+            # Record new unique location
+            if self._is_new_location(mac, lat, lon):
+                self._record_location(p, {
+                    "lat": lat, "lon": lon,
+                    "label": cps[cp_idx].location_label,
+                    "timestamp": ts_last,
+                    "signal": signal,
+                })
 
     def _compute_scores(self):
         """
@@ -259,8 +682,10 @@ class MultiLocationTracker:
           score = unique_location_count^2 * log(total_hits + 1) * recency_weight
         Higher weight for devices seen at many distinct locations frequently.
         """
-        import math
         now = datetime.now()
+        if HAS_NUMPY and self.profiles:
+            self._compute_scores_vec(now)
+            return
         for p in self.profiles.values():
             if p.unique_location_count < 2:
                 p.stalker_score = 0.0
@@ -277,6 +702,22 @@ class MultiLocationTracker:
                 * recency
             )
 
+    def _compute_scores_vec(self, now: datetime):
+        """_compute_scores as one numpy expression over all profiles."""
+        profs = list(self.profiles.values())
+        n = len(profs)
+        locs = np.fromiter((p.unique_location_count for p in profs), dtype=float, count=n)
+        hits = np.fromiter((p.total_hits for p in profs), dtype=float, count=n)
+        # Naive seconds since epoch, so differences match naive datetime subtraction;
+        # NaN where last_seen doesn't parse (→ 0.5 recency) or the score is 0 anyway
+        last_ts = np.fromiter((_naive_ts(p.last_seen) if p.unique_location_count >= 2 else math.nan
+                               for p in profs), dtype=float, count=n)
+        days_ago = np.maximum(0, (_naive_ts(now) - last_ts) / 86400)
+        recency = np.where(np.isnan(last_ts), 0.5, 1.0 / (1 + days_ago))
+        scores = np.where(locs >= 2, locs * locs * np.log(hits + 1) * recency, 0.0)
+        for p, score in zip(profs, scores.tolist()):
+            p.stalker_score = score
+
     def get_ranked_stalkers(self, min_locations: int = 2, limit: int = 20) -> list[StalkerProfile]:
         """Return devices seen at 2+ distinct GPS locations, ranked by stalker score."""
         candidates = [
@@ -292,10 +733,7 @@ class MultiLocationTracker:
             print("\n[MLT] No multi-location suspects found yet. Build up GPS data first.")
             return
 
-        try:
-            from rich.console import Console
-            from rich.table import Table
-            from rich import box
+        if HAS_RICH:
             c = Console()
             t = Table(title="📍 SentinelWatch — Multi-Location Stalker Ranking",
                       box=box.ROUNDED, header_style="bold red", border_style="red")
@@ -314,11 +752,11 @@ class MultiLocationTracker:
                     f"[red]{p.stalker_score:.2f}[/red]",
                     str(p.unique_location_count),
                     str(p.total_hits),
-                    ", ".join(p.ssids[:2]) or "—",
+                    ", ".join(sorted(p.ssids)[:2]) or "—",
                     locs
                 )
             c.print(t)
-        except ImportError:
+        else:
             print(f"\n{'─'*90}")
             print("  📍 MULTI-LOCATION STALKER RANKING")
             print(f"{'─'*90}")
@@ -326,7 +764,7 @@ class MultiLocationTracker:
                 locs = " → ".join(l["label"] for l in p.locations_seen[:4])
                 print(f"  #{i} {p.label or p.mac:<22} Score:{p.stalker_score:.2f}  "
                       f"Locations:{p.unique_location_count}  Hits:{p.total_hits}")
-                print(f"     SSIDs: {', '.join(p.ssids[:3]) or '(none)'}  Path: {locs}")
+                print(f"     SSIDs: {', '.join(sorted(p.ssids)[:3]) or '(none)'}  Path: {locs}")
             print(f"{'─'*90}\n")
 
 
@@ -3,17 +3,42 @@ notifications.py — SentinelWatch Multi-Channel Alert Dispatcher
 Handles Resend.io email + Twilio SMS notifications with level filtering.
 """
 
+import atexit
+import functools
+import html
 import json
 import os
+import queue
+import string
+import threading
 from datetime import datetime
 from typing import Optional
 
+# Channel SDKs are optional — each sender reports and skips when its SDK is missing
+try:
+    import resend
+    HAS_RESEND = True
+except ImportError:
+    HAS_RESEND = False
 
-def _load_config(config_path: str = "config.json") -> dict:
+try:
+    from twilio.rest import Client as TwilioClient
+    HAS_TWILIO = True
+except ImportError:
+    HAS_TWILIO = False
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_path: str, mtime_ns: int) -> dict:
     with open(config_path, "r") as f:
         return json.load(f)
 
 
+def _load_config(config_path: str = "config.json") -> dict:
+    """Parsed config, re-read only when the file's mtime changes. Treat as read-only."""
+    return _load_config_cached(config_path, os.stat(config_path).st_mtime_ns)
+
+
 # ──────────────────────────────────────────────
 #  Resend.io Email
 # ──────────────────────────────────────────────
@@ -27,8 +52,11 @@ def send_resend_email(subject: str, body: str, config: dict) -> bool:
         print("[Resend] No API key configured.")
         return False
 
+    if not HAS_RESEND:
+        print("[Resend] Failed: resend package not installed.")
+        return False
+
     try:
-        import resend
         resend.api_key = api_key
         params = {
             "from": cfg.get("from_email", "sentinelwatch@yourdomain.com"),
@@ -45,33 +73,38 @@ def send_resend_email(subject: str, body: str, config: dict) -> bool:
         return False
 
 
-def _format_html_email(subject: str, body: str) -> str:
-    color = "#ff4444" if "CRITICAL" in subject.upper() else "#ff8c00" if "WARNING" in subject.upper() else "#00bfff"
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    return f"""<!DOCTYPE html>
+# Built once at import; fields are HTML-escaped before substitution
+_EMAIL_TMPL = string.Template("""<!DOCTYPE html>
 <html>
 <head><meta charset="utf-8"></head>
 <body style="background:#0a0a0f;color:#e0e0e0;font-family:system-ui,-apple-system,sans-serif;padding:32px;">
   <div style="max-width:600px;margin:0 auto;background:rgba(255,255,255,0.04);
               border:1px solid rgba(255,255,255,0.1);border-radius:16px;overflow:hidden;">
-    <div style="background:{color};padding:20px 28px;">
+    <div style="background:$color;padding:20px 28px;">
       <h1 style="margin:0;color:#fff;font-size:20px;font-weight:700;">
         🛡 SentinelWatch Alert
       </h1>
-      <p style="margin:4px 0 0;color:rgba(255,255,255,0.85);font-size:13px;">{ts}</p>
+      <p style="margin:4px 0 0;color:rgba(255,255,255,0.85);font-size:13px;">$ts</p>
     </div>
     <div style="padding:28px;">
-      <h2 style="color:{color};margin-top:0;font-size:16px;">{subject}</h2>
-      <p style="line-height:1.7;color:#d0d0d0;white-space:pre-wrap;">{body}</p>
+      <h2 style="color:$color;margin-top:0;font-size:16px;">$subject</h2>
+      <p style="line-height:1.7;color:#d0d0d0;white-space:pre-wrap;">$body</p>
       <hr style="border:none;border-top:1px solid rgba(255,255,255,0.08);margin:24px 0;">
       <p style="font-size:11px;color:#555;margin:0;">
         Sent by SentinelWatch Surveillance Detection System<br>
-        <a href="http://localhost:8888" style="color:{color};">Open Dashboard →</a>
+        <a href="http://localhost:8888" style="color:$color;">Open Dashboard →</a>
       </p>
     </div>
   </div>
 </body>
-</html>"""
+</html>""")
+
+
+def _format_html_email(subject: str, body: str) -> str:
+    color = "#ff4444" if "CRITICAL" in subject.upper() else "#ff8c00" if "WARNING" in subject.upper() else "#00bfff"
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return _EMAIL_TMPL.substitute(color=color, ts=ts,
+                                  subject=html.escape(subject), body=html.escape(body))
 
 
 # ──────────────────────────────────────────────
@@ -92,9 +125,12 @@ def send_twilio_sms(message: str, config: dict) -> bool:
         print("[Twilio] Incomplete configuration — check config.json")
         return False
 
+    if not HAS_TWILIO:
+        print("[Twilio] Failed: twilio package not installed.")
+        return False
+
     try:
-        from twilio.rest import Client
-        client = Client(account_sid, auth_token)
+        client = TwilioClient(account_sid, auth_token)
         ts = datetime.now().strftime("%H:%M:%S")
         full_msg = f"🛡 SentinelWatch [{ts}]\n{message}\n\nDashboard: http://localhost:8888"
         msg = client.messages.create(body=full_msg, from_=from_num, to=to_num)
@@ -108,18 +144,15 @@ def send_twilio_sms(message: str, config: dict) -> bool:
 # ──────────────────────────────────────────────
 #  Main dispatcher
 # ──────────────────────────────────────────────
-def dispatch_alert(level: str, message: str, config: Optional[dict] = None,
-                   config_path: str = "config.json"):
-    """
-    Fire alert to all enabled channels based on level filtering.
-    level: "INFO" | "WARNING" | "CRITICAL"
-    """
-    if config is None:
-        try:
-            config = _load_config(config_path)
-        except Exception:
-            return
+_alert_queue: "queue.Queue[tuple]" = queue.Queue()
+# Most seconds exit waits for queued alerts; neither SDK call has a timeout of its own
+ALERT_FLUSH_TIMEOUT = 5
+_alert_worker_lock = threading.Lock()
+_alert_worker_thread: Optional[threading.Thread] = None
 
+
+def _send_alert(level: str, message: str, config: dict):
+    """Send one alert to every channel whose send_on list includes its level."""
     alert_cfg = config.get("alerts", {})
 
     # ── Resend email ──────────────────────────
@@ -138,6 +171,60 @@ def dispatch_alert(level: str, message: str, config: Optional[dict] = None,
             send_twilio_sms(f"[{level}] {message}", config)
 
 
+def _alert_worker():
+    while True:
+        level, message, config = _alert_queue.get()
+        try:
+            _send_alert(level, message, config)
+        except Exception as e:
+            print(f"[Dispatch] Failed: {e}")
+        finally:
+            _alert_queue.task_done()
+
+
+def _ensure_alert_worker():
+    global _alert_worker_thread
+    with _alert_worker_lock:
+        if _alert_worker_thread is None or not _alert_worker_thread.is_alive():
+            _alert_worker_thread = threading.Thread(target=_alert_worker, daemon=True,
+                                                    name="alert-dispatch")
+            _alert_worker_thread.start()
+
+
+def dispatch_alert(level: str, message: str, config: Optional[dict] = None,
+                   config_path: str = "config.json"):
+    """
+    Fire alert to all enabled channels based on level filtering.
+    level: "INFO" | "WARNING" | "CRITICAL"
+    Sends happen on a background thread; this returns immediately.
+    """
+    if config is None:
+        try:
+            config = _load_config(config_path)
+        except Exception:
+            return
+
+    alert_cfg = config.get("alerts", {})
+    if not (alert_cfg.get("resend", {}).get("enabled") or alert_cfg.get("twilio", {}).get("enabled")):
+        return
+
+    _ensure_alert_worker()
+    _alert_queue.put((level, message, config))
+
+
+def flush_alerts(timeout: Optional[float] = ALERT_FLUSH_TIMEOUT) -> bool:
+    """
+    Block until every queued alert has been sent (or has failed), for at most
+    `timeout` seconds (None waits indefinitely). Returns False if some are still pending.
+    """
+    with _alert_queue.all_tasks_done:
+        return _alert_queue.all_tasks_done.wait_for(lambda: not _alert_queue.unfinished_tasks, timeout)
+
+
+# Deliver anything still queued before the interpreter exits
+atexit.register(flush_alerts)
+
+
 # ──────────────────────────────────────────────
 #  Known device arrival notification
 # ──────────────────────────────────────────────
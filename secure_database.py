@@ -4,9 +4,10 @@ Secure database operations - prevents SQL injection
 import sqlite3
 import json
 import logging
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterator
 from datetime import datetime, timedelta
 import time
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,12 @@ class SecureKismetDB:
         try:
             self._connection = sqlite3.connect(self.db_path, timeout=30.0)
             self._connection.row_factory = sqlite3.Row  # Enable column access by name
+            # 64 MB page cache and 256 MB of mmap for full-table device sweeps; this
+            # wrapper only reads. Journal/sync pragmas are left alone: the file
+            # belongs to a possibly still-running Kismet.
+            self._connection.execute("PRAGMA cache_size=-64000")
+            self._connection.execute("PRAGMA mmap_size=268435456")
+            self._connection.execute("PRAGMA query_only=1")
             logger.info(f"Connected to database: {self.db_path}")
         except sqlite3.Error as e:
             logger.error(f"Failed to connect to database {self.db_path}: {e}")
@@ -40,6 +47,18 @@ class SecureKismetDB:
             self._connection.close()
             self._connection = None
     
+    @contextmanager
+    def read_transaction(self):
+        """Run the enclosed queries in one deferred read transaction (one lock, one snapshot)"""
+        if not self._connection:
+            raise RuntimeError("Database not connected")
+        
+        self._connection.execute("BEGIN DEFERRED")
+        try:
+            yield self
+        finally:
+            self._connection.execute("COMMIT")
+    
     def execute_safe_query(self, query: str, params: Tuple = ()) -> List[sqlite3.Row]:
         """Execute parameterized query safely"""
         if not self._connection:
@@ -53,6 +72,29 @@ class SecureKismetDB:
             logger.error(f"Database query failed: {query}, params: {params}, error: {e}")
             raise
     
+    def execute_safe_query_iter(self, query: str, params: Tuple = (), chunk: int = 1024,
+                                tuples: bool = False) -> Iterator[List]:
+        """
+        Execute parameterized query safely, yielding rows in lists of up to `chunk`.
+        tuples: plain tuples instead of sqlite3.Row (they unpack faster than Row lookups).
+        """
+        if not self._connection:
+            raise RuntimeError("Database not connected")
+        
+        try:
+            cursor = self._connection.cursor()
+            if tuples:
+                cursor.row_factory = None
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    break
+                yield rows
+        except sqlite3.Error as e:
+            logger.error(f"Database query failed: {query}, params: {params}, error: {e}")
+            raise
+    
     def get_devices_by_time_range(self, start_time: float, end_time: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Get devices within time range with proper parameterization
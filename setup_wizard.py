@@ -2,19 +2,68 @@
 setup_wizard.py — SentinelWatch Setup Wizard (macOS M1)
 One-click auto-install for all dependencies. Run once to configure.
 """
+import atexit
+import contextlib
+import functools
+import glob
+import hashlib
 import json
 import os
+import re
+import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional
+
+# importlib.metadata, venv and selectors are imported where used: they account for
+# most of the import time and only matter once setup is actually under way
+
+# Try orjson for faster config parse/serialize
+try:
+    import orjson
+    HAS_ORJSON = True
+    _json_loads = orjson.loads
+except ImportError:
+    HAS_ORJSON = False
+    _json_loads = json.loads
+
+# Line editing for prompts; absent on some platforms
+try:
+    import readline
+    # macOS system Python links libedit, which takes a different bind syntax
+    readline.parse_and_bind("bind ^I rl_complete" if "libedit" in (readline.__doc__ or "")
+                            else "tab: complete")
+    readline.set_completer_delims(" \t\n;")
+    HAS_READLINE = True
+except ImportError:
+    HAS_READLINE = False
+
+# Used for version specifiers when present (pip/setuptools usually pull it in)
+try:
+    from packaging.requirements import Requirement
+    HAS_PACKAGING = True
+except ImportError:
+    HAS_PACKAGING = False
 
-CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
 REPO_DIR    = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(REPO_DIR, "config.json")
+REQ_FILE    = os.path.join(REPO_DIR, "requirements.txt")
+MIGRATE     = os.path.join(REPO_DIR, "migrate_credentials.py")
 VENV_DIR    = os.path.join(REPO_DIR, "venv")
+VENV_BIN    = os.path.join(VENV_DIR, "bin")
+VENV_PY     = os.path.join(VENV_BIN, "python3")
+VENV_PIP    = os.path.join(VENV_BIN, "pip")
+REQS_HASH   = os.path.join(VENV_DIR, ".reqs_hash")
+LAUNCHER_PATH = Path.home() / "Desktop" / "SentinelWatch.command"
 
 R="\033[91m"; G="\033[92m"; C="\033[96m"; Y="\033[93m"
 B="\033[1m";  D="\033[0m";  GR="\033[90m"; M="\033[95m"
+_ANSI_RE = re.compile(r"(\033\[[0-9;]*m)")
 
 REQUIRED_PACKAGES = [
     "requests>=2.28.0",
@@ -25,52 +74,199 @@ REQUIRED_PACKAGES = [
     "rich>=13.0.0",
     "resend>=2.0.0",
     "twilio>=9.0.0",
+    "psutil>=5.9.0",
+    "fpdf2>=2.7.0",
 ]
 
 BREW_PACKAGES = ["kismet", "python@3.11"]
 
+# Ignored by pip versions without the parallel-downloads option
+PIP_ENV = {"PIP_PARALLEL_DOWNLOADS": "8"}
+# Skip the tap refresh, post-install cleanup and analytics ping on every brew call
+BREW_ENV = {"HOMEBREW_NO_AUTO_UPDATE": "1", "HOMEBREW_NO_INSTALL_CLEANUP": "1",
+            "HOMEBREW_NO_ANALYTICS": "1"}
+
 def h(text):  print(f"\n{B}{C}{'─'*60}\n  {text}\n{'─'*60}{D}")
 def ok(t):    print(f"  {G}✓{D}  {t}")
 def warn(t):  print(f"  {Y}⚠{D}  {t}")
 def err(t):   print(f"  {R}✗{D}  {t}")
 def info(t):  print(f"  {GR}›{D}  {t}")
-def ask(prompt, default=""):
-    val = input(f"\n  {C}→{D} {prompt} {GR}[{default}]{D}: ").strip()
+def write_block(data):
+    """Emit a pre-encoded multi-line block with a single write."""
+    sys.stdout.flush()
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        print(data.decode(), end="")
+        return
+    out.write(data)
+    out.flush()
+
+def _input(prompt):
+    if HAS_READLINE:
+        # Mark colour codes as zero-width so readline's line editing stays aligned
+        prompt = _ANSI_RE.sub("\001\\1\002", prompt)
+    return input(prompt)
+
+def _path_completer(text, state):
+    matches = sorted(glob.glob(os.path.expanduser(text) + "*"))
+    return matches[state] if state < len(matches) else None
+
+def ask(prompt, default="", complete_paths=False):
+    if not HAS_READLINE:
+        val = _input(f"\n  {C}→{D} {prompt} {GR}[{default}]{D}: ").strip()
+        return val if val else default
+    # Pre-fill the current value as editable text instead of making the user retype it
+    readline.set_startup_hook(lambda: readline.insert_text(default))
+    readline.set_completer(_path_completer if complete_paths else None)
+    try:
+        val = _input(f"\n  {C}→{D} {prompt}: ").strip()
+    finally:
+        readline.set_startup_hook(None)
+        readline.set_completer(None)
     return val if val else default
 
+_INT_RE   = re.compile(r"\A\d+\Z")
+_PHONE_RE = re.compile(r"\A\+\d{10,15}\Z")
+_EMAIL_RE = re.compile(r"\A[^@\s]+@[^@\s]+\.[^@\s]+\Z")
+_URL_RE   = re.compile(r"\Ahttps?://[^\s]+\Z")
+
+def ask_valid(prompt, default, pattern, hint):
+    """ask() until the answer matches pattern; an empty answer still takes the default."""
+    while True:
+        val = ask(prompt, default)
+        if not val or pattern.match(val):
+            return val
+        warn(f"Expected {hint}")
+
+def ask_int(prompt, default):
+    return int(ask_valid(prompt, str(default), _INT_RE, "a whole number") or default)
+
 def yn(prompt, default_yes=True):
     hint = "Y/n" if default_yes else "y/N"
-    val = input(f"\n  {C}→{D} {prompt} {GR}[{hint}]{D}: ").strip().lower()
+    val = _input(f"\n  {C}→{D} {prompt} {GR}[{hint}]{D}: ").strip().lower()
     if not val: return default_yes
     return val in ("y", "yes")
 
-def run_cmd(cmd, capture=False, timeout=180):
+def run_cmd(cmd, capture=False, timeout=180, env=None):
+    """Run cmd; `env` entries are layered over the current environment."""
+    if env:
+        env = {**os.environ, **env}
     if capture:
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        r = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, env=env)
         return r.returncode == 0, r.stdout, r.stderr
     else:
-        r = subprocess.run(cmd, timeout=timeout)
+        r = subprocess.run(cmd, timeout=timeout, env=env)
         return r.returncode == 0
 
+def read_requirements(req_file):
+    """Requirement specifiers from a requirements.txt, comments and blanks dropped."""
+    with open(req_file) as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+def _canon(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def installed_versions(site_dirs=None):
+    """{canonical name: version} for site_dirs (default sys.path), from dist metadata only."""
+    from importlib.metadata import distributions
+    installed = {}
+    for dist in distributions(**({"path": site_dirs} if site_dirs else {})):
+        name = dist.metadata["Name"]
+        if name:
+            installed.setdefault(_canon(name), dist.version)
+    return installed
+
+def missing_packages(reqs, site_dirs=None):
+    """Requirements not satisfied in site_dirs (default sys.path)."""
+    installed = installed_versions(site_dirs)
+    missing = []
+    for spec in reqs:
+        if HAS_PACKAGING:
+            req = Requirement(spec)
+            version = installed.get(_canon(req.name))
+            satisfied = version is not None and req.specifier.contains(version, prereleases=True)
+        else:
+            satisfied = _canon(re.split(r"[<>=!~;\[\s]", spec, 1)[0]) in installed
+        if not satisfied:
+            missing.append(spec)
+    return missing
+
+def venv_site_dirs():
+    return glob.glob(os.path.join(VENV_DIR, "lib", "python*", "site-packages"))
+
+def requirements_hash(site_dirs):
+    """Digest of requirements.txt, the venv's interpreter config and what is installed in it."""
+    h = hashlib.blake2b(digest_size=16)
+    for path in (REQ_FILE, os.path.join(VENV_DIR, "pyvenv.cfg")):
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            pass
+    # Same information as `pip freeze`, without starting pip
+    for name, version in sorted(installed_versions(site_dirs).items()):
+        h.update(f"{name}=={version}\n".encode())
+    return h.hexdigest()
+
+def save_requirements_hash():
+    site_dirs = venv_site_dirs()
+    if site_dirs:
+        with open(REQS_HASH, "w") as f:
+            f.write(requirements_hash(site_dirs))
+
+@functools.lru_cache(maxsize=None)
 def has_command(cmd):
-    ok_, *_ = run_cmd(["which", cmd], capture=True)
-    return ok_
-
-def spinner(msg, duration=1.5):
+    """PATH lookup without spawning `which`; cleared after installs that add commands."""
+    return shutil.which(cmd) is not None
+
+KISMET_BIN_DIRS = ["/opt/homebrew/bin", "/usr/local/bin"]
+
+def kismet_installed():
+    """One directory read per Homebrew bin dir instead of a stat per candidate path."""
+    for d in KISMET_BIN_DIRS:
+        try:
+            with os.scandir(d) as it:
+                if "kismet" in {e.name for e in it}:
+                    return True
+        except OSError:
+            continue
+    return False
+
+def _show_cursor():
+    print("\x1b[?25h", end="", flush=True)
+
+@contextlib.contextmanager
+def spinner(msg):
+    """Animate msg while the with-block runs; the line is cleared for the result message."""
     frames = ["⠋","⠙","⠹","⠸","⠼","⠴","⠦","⠧","⠇","⠏"]
-    t = time.time()
-    i = 0
-    while time.time() - t < duration:
-        print(f"\r  {C}{frames[i % len(frames)]}{D}  {msg}", end="", flush=True)
-        time.sleep(0.1); i += 1
-    print(f"\r  {G}✓{D}  {msg:<50}")
+    stop = threading.Event()
+
+    def animate():
+        # Full line once with the cursor hidden, then only the frame glyph per tick
+        print(f"\x1b[?25l\r  {C}{frames[0]}{D}  {msg}", end="", flush=True)
+        i = 1
+        while not stop.wait(0.1):
+            print(f"\r  {C}{frames[i % len(frames)]}{D}", end="", flush=True)
+            i += 1
+
+    atexit.register(_show_cursor)   # in case Ctrl-C kills us mid-spin
+    t = threading.Thread(target=animate, daemon=True)
+    t.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        t.join()
+        print(f"\r{' ' * (len(msg) + 6)}\r\x1b[?25h", end="", flush=True)
+        atexit.unregister(_show_cursor)
 
 
 # ══════════════════════════════════════════════
 #  BANNER
 # ══════════════════════════════════════════════
-def banner():
-    print(f"""
+# Pre-rendered so each block goes out in one write
+_BANNER = f"""
 {B}{M}
   ╔══════════════════════════════════════════════════╗
   ║   🛡  SentinelWatch — Setup Wizard v1.0         ║
@@ -84,14 +280,19 @@ def banner():
     {G}4.{D} Check / install Kismet
     {G}5.{D} Configure Kismet, Resend.io, and Twilio
     {G}6.{D} Create a {B}~/Desktop/SentinelWatch.command{D} one-click launcher
-""")
-    time.sleep(0.5)
+
+""".encode()
+
+
+def banner():
+    write_block(_BANNER)
 
 
 # ══════════════════════════════════════════════
 #  STEP 1: System checks + Homebrew
 # ══════════════════════════════════════════════
 def step_homebrew():
+    """Prompts only; returns True if Homebrew should be installed."""
     h("Step 1 of 6 — System Check & Homebrew")
 
     # Python version check
@@ -105,114 +306,136 @@ def step_homebrew():
     # Homebrew
     if has_command("brew"):
         ok("Homebrew installed")
-    else:
-        warn("Homebrew NOT found")
-        if yn("Install Homebrew automatically? (recommended)", default_yes=True):
-            print(f"\n  {C}Installing Homebrew (this may ask for your password)…{D}\n")
-            success = run_cmd([
-                "/bin/bash", "-c",
-                'NONINTERACTIVE=1 /bin/bash -c "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"'
-            ])
-            if success:
-                ok("Homebrew installed successfully")
-            else:
-                warn("Homebrew install had issues. Try manually: https://brew.sh")
-        else:
-            warn("Skipping Homebrew — some features may not work")
+        return False
+    warn("Homebrew NOT found")
+    if yn("Install Homebrew automatically? (recommended)", default_yes=True):
+        info("Homebrew will be installed once all questions are answered")
+        return True
+    warn("Skipping Homebrew — some features may not work")
+    return False
 
 
 # ══════════════════════════════════════════════
 #  STEP 2: Python venv + pip auto-install
 # ══════════════════════════════════════════════
 def step_dependencies():
+    """Prompts only; returns the venv/pip plan consumed by run_installs."""
     h("Step 2 of 6 — Python Dependencies (Auto-Install)")
 
-    venv_python = os.path.join(VENV_DIR, "bin", "python3")
-    venv_pip    = os.path.join(VENV_DIR, "bin", "pip")
+    create_venv = False
 
     # Check if venv exists and is healthy
-    venv_ok = os.path.exists(venv_python)
+    venv_ok = os.path.exists(VENV_PY)
     if venv_ok:
         ok(f"Virtual environment found: {VENV_DIR}")
     else:
         warn("No virtual environment found")
         if yn("Create virtual environment now? (recommended)", default_yes=True):
-            print(f"\n  {C}Creating venv…{D}")
-            success = run_cmd([sys.executable, "-m", "venv", VENV_DIR])
-            if success:
-                ok("Virtual environment created → venv/")
-                venv_python = os.path.join(VENV_DIR, "bin", "python3")
-                venv_pip    = os.path.join(VENV_DIR, "bin", "pip")
-                venv_ok = True
-            else:
-                err("Failed to create venv. Try: python3 -m venv venv")
-                venv_ok = False
+            create_venv = True
         else:
             info("Using system Python — packages will be installed globally")
-            venv_python = sys.executable
-            venv_pip = os.path.join(os.path.dirname(sys.executable), "pip3")
 
-    # Always offer to install all deps
-    print(f"\n  {B}Required packages:{D}")
-    for pkg in REQUIRED_PACKAGES:
-        print(f"    {GR}•{D} {pkg}")
+    # Nothing changed since the last successful install: skip pip's resolver entirely
+    site_dirs = venv_site_dirs() if venv_ok else None
+    if site_dirs:
+        try:
+            with open(REQS_HASH) as f:
+                up_to_date = f.read().strip() == requirements_hash(site_dirs)
+        except OSError:
+            up_to_date = False
+        if up_to_date:
+            ok("Dependencies up to date (hash match)")
+            return {"create_venv": False, "use_venv": True, "install": False}
+
+    # Always offer to install all deps; metadata scan only, nothing gets imported
+    if create_venv or (venv_ok and not site_dirs):
+        missing = REQUIRED_PACKAGES
+    else:
+        missing = missing_packages(REQUIRED_PACKAGES, site_dirs)
+    print(f"\n  {B}Required packages:{D}\n" + "\n".join(
+        f"    {GR}•{D} {pkg}" if pkg in missing else f"    {G}✓{D} {pkg}" for pkg in REQUIRED_PACKAGES))
+    if not missing:
+        ok("All required packages already installed")
+
+    install = yn("\n  Install / upgrade all packages now?", default_yes=bool(missing))
+    if not install:
+        info("Skipped. Run later: pip install -r requirements.txt")
+    return {"create_venv": create_venv, "use_venv": venv_ok or create_venv, "install": install}
+
+
+def create_venv():
+    print()
+    with spinner("Creating venv…"):
+        try:
+            # Same result as `python -m venv` without starting another interpreter
+            import venv
+            venv.EnvBuilder(with_pip=True, symlinks=(os.name != "nt")).create(VENV_DIR)
+            success = True
+        except (subprocess.CalledProcessError, OSError):
+            success = False
+    if not success:
+        # Re-run via the CLI so its diagnostics reach the terminal
+        success = run_cmd([sys.executable, "-m", "venv", VENV_DIR])
+    if success:
+        ok("Virtual environment created → venv/")
+    else:
+        err("Failed to create venv. Try: python3 -m venv venv")
+    return success
 
-    if yn("\n  Install / upgrade all packages now?", default_yes=True):
-        print(f"\n  {C}Installing dependencies — this may take 30–90 seconds…{D}\n")
-        req_file = os.path.join(REPO_DIR, "requirements.txt")
 
-        pip_cmd = venv_pip if (venv_ok and os.path.exists(venv_pip)) else "pip3"
+def pip_install_cmd(use_venv):
+    """(install command prefix, pip executable) for the chosen environment."""
+    pip_cmd = VENV_PIP if (use_venv and os.path.exists(VENV_PIP)) else "pip3"
+    if use_venv and os.path.exists(VENV_PY) and has_command("uv"):
+        # uv resolves, downloads and unpacks in parallel without a Python startup
+        return ["uv", "pip", "install", "--python", VENV_PY, "--upgrade"], pip_cmd
+    return [pip_cmd, "install", "--upgrade"], pip_cmd
 
-        success = run_cmd([
-            pip_cmd, "install", "--upgrade", "-r", req_file
-        ])
-        if success:
-            ok("All Python packages installed successfully ✨")
-        else:
-            warn("Some packages may have failed. Check output above.")
-            info(f"Manual install: {pip_cmd} install -r requirements.txt")
-    else:
-        info("Skipped. Run later: pip install -r requirements.txt")
 
-    return venv_ok
+def retry_packages(install, pip_cmd):
+    warn("Batch install failed — retrying packages one at a time…")
+    failed = [pkg for pkg in read_requirements(REQ_FILE)
+              if not run_cmd([*install, pkg], env=PIP_ENV)]
+    if failed:
+        warn(f"Failed: {', '.join(failed)}. Check output above.")
+        info(f"Manual install: {pip_cmd} install -r requirements.txt")
+        return False
+    ok("All Python packages installed successfully ✨")
+    return True
 
 
 # ══════════════════════════════════════════════
 #  STEP 3: Kismet
 # ══════════════════════════════════════════════
-def step_kismet_install():
+def step_kismet_install(brew_planned=False):
+    """Prompts only; returns (install_kismet, run_migration)."""
     h("Step 3 of 6 — Kismet Packet Capture")
 
-    kismet_paths = ["/opt/homebrew/bin/kismet", "/usr/local/bin/kismet"]
-    kismet_found = any(os.path.exists(p) for p in kismet_paths)
-
-    if kismet_found:
+    install_kismet = False
+    if kismet_installed():
         ok("Kismet installed (Homebrew)")
     else:
         warn("Kismet NOT found")
         print(f"\n  {GR}Kismet is required for live packet capture.{D}")
         print(f"  {GR}SentinelWatch can still analyze saved .kismet files without it.{D}\n")
 
-        if has_command("brew"):
-            if yn("Install Kismet via Homebrew now? (~5 min)", default_yes=True):
-                print(f"\n  {C}Running: brew install kismet…{D}\n")
-                run_cmd(["brew", "install", "kismet"])
-                if any(os.path.exists(p) for p in kismet_paths):
-                    ok("Kismet installed successfully!")
-                else:
-                    warn("Kismet install may have issues. Check brew output.")
+        if brew_planned or has_command("brew"):
+            install_kismet = yn("Install Kismet via Homebrew now? (~5 min)", default_yes=True)
         else:
             info("Install manually: brew install kismet")
             info("Or download from: https://www.kismetwireless.net/")
 
-    # Credentials migration check
-    migrate = os.path.join(REPO_DIR, "migrate_credentials.py")
-    if os.path.exists(migrate):
-        if yn("Run secure credential migration? (REQUIRED for first use)", default_yes=True):
-            venv_python = os.path.join(VENV_DIR, "bin", "python3")
-            py = venv_python if os.path.exists(venv_python) else sys.executable
-            run_cmd([py, migrate])
-            ok("Credential migration complete")
+    # Credentials migration check (interactive, so it runs after the installs finish)
+    migrate = False
+    if os.path.exists(MIGRATE):
+        migrate = yn("Run secure credential migration? (REQUIRED for first use)", default_yes=True)
+    return install_kismet, migrate
+
+
+def run_migration():
+    py = VENV_PY if os.path.exists(VENV_PY) else sys.executable
+    run_cmd([py, MIGRATE])
+    ok("Credential migration complete")
 
 
 # ══════════════════════════════════════════════
@@ -222,14 +445,21 @@ def step_kismet_config(cfg):
     h("Step 4 of 6 — Kismet Connection")
 
     api = cfg.setdefault("kismet_api", {})
-    api["base_url"] = ask("Kismet URL", api.get("base_url", "http://localhost:2501"))
+    api["base_url"] = ask_valid("Kismet URL", api.get("base_url", "http://localhost:2501"), _URL_RE, "an http(s):// URL")
     api["username"] = ask("Kismet username", api.get("username", "kismet"))
     api["password"] = ask("Kismet password (Enter to skip)", api.get("password", ""))
 
     paths = cfg.setdefault("paths", {})
     home = os.path.expanduser("~")
     default_db = f"{home}/*.kismet"
-    paths["kismet_logs"] = ask("Kismet .kismet DB path (glob)", paths.get("kismet_logs", default_db))
+    paths["kismet_logs"] = ask("Kismet .kismet DB path (glob)", paths.get("kismet_logs", default_db),
+                              complete_paths=True)
+    # Kept as a pattern: Kismet starts a new log file every session
+    found = glob.glob(os.path.expanduser(paths["kismet_logs"]))
+    if found:
+        info(f"{len(found)} .kismet file(s) currently match")
+    else:
+        warn("No files match yet — they will be picked up once Kismet starts logging there")
     ok("Kismet config saved")
 
 
@@ -246,8 +476,8 @@ def step_notifications(cfg):
     if yn("  Enable email alerts?", default_yes=False):
         rs["enabled"] = True
         rs["api_key"]    = ask("  Resend API Key", rs.get("api_key",""))
-        rs["from_email"] = ask("  From email", rs.get("from_email","sentinelwatch@yourdomain.com"))
-        rs["to_email"]   = ask("  To email", rs.get("to_email",""))
+        rs["from_email"] = ask_valid("  From email", rs.get("from_email","sentinelwatch@yourdomain.com"), _EMAIL_RE, "an email address")
+        rs["to_email"]   = ask_valid("  To email", rs.get("to_email",""), _EMAIL_RE, "an email address")
         level = ask("  Alert levels (CRITICAL / CRITICAL,WARNING / all)", "CRITICAL")
         rs["send_on"] = [l.strip().upper() for l in level.split(",")]
         ok("Resend.io email enabled")
@@ -262,8 +492,8 @@ def step_notifications(cfg):
         tw["enabled"]     = True
         tw["account_sid"] = ask("  Account SID", tw.get("account_sid",""))
         tw["auth_token"]  = ask("  Auth Token", tw.get("auth_token",""))
-        tw["from_number"] = ask("  From number (+1xxxxxxxxxx)", tw.get("from_number",""))
-        tw["to_number"]   = ask("  Your number (+1xxxxxxxxxx)", tw.get("to_number",""))
+        tw["from_number"] = ask_valid("  From number (+1xxxxxxxxxx)", tw.get("from_number",""), _PHONE_RE, "+ and 10–15 digits")
+        tw["to_number"]   = ask_valid("  Your number (+1xxxxxxxxxx)", tw.get("to_number",""), _PHONE_RE, "+ and 10–15 digits")
         tw["send_on"]     = ["CRITICAL"]
         ok("Twilio SMS enabled (CRITICAL alerts only)")
     else:
@@ -278,44 +508,183 @@ def step_notifications(cfg):
     arr = yn("  Notify on known device arrival?", default_yes=True)
     alerts["known_device_arrival_notify"] = arr
 
-    linger = ask("  Alert on unknown SSID linger after (minutes)", str(timing.get("unknown_ssid_linger_minutes", 5)))
-    timing["unknown_ssid_linger_minutes"] = int(linger)
-
-    poi = ask("  Person of Interest min encounters", str(thresh.get("person_of_interest_min_encounters", 3)))
-    thresh["person_of_interest_min_encounters"] = int(poi)
+    timing["unknown_ssid_linger_minutes"] = ask_int(
+        "  Alert on unknown SSID linger after (minutes)", timing.get("unknown_ssid_linger_minutes", 5))
+    thresh["person_of_interest_min_encounters"] = ask_int(
+        "  Person of Interest min encounters", thresh.get("person_of_interest_min_encounters", 3))
 
 
 # ══════════════════════════════════════════════
-#  STEP 6: Save + Desktop Launcher
+#  Installs (after every question is answered)
 # ══════════════════════════════════════════════
-def step_finish(cfg):
-    h("Step 6 of 6 — Save & Create Desktop Launcher")
+HOMEBREW_INSTALL = [
+    "/bin/bash", "-c",
+    'NONINTERACTIVE=1 /bin/bash -c "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"'
+]
 
-    # Save config
-    with open(CONFIG_PATH, "w") as f:
-        json.dump(cfg, f, indent=2)
-    ok(f"Config saved → {CONFIG_PATH}")
 
-    # Desktop launcher
-    desktop = Path.home() / "Desktop" / "SentinelWatch.command"
-    venv_activate = os.path.join(VENV_DIR, "bin", "activate")
-    script = f"""#!/bin/bash
+def brew_path():
+    """brew right after a fresh install may not be on this process's PATH yet."""
+    has_command.cache_clear()
+    for path in [shutil.which("brew"), *(os.path.join(d, "brew") for d in KISMET_BIN_DIRS)]:
+        if path and os.path.exists(path):
+            return path
+    return "brew"
+
+
+@dataclass
+class ParallelInstallJob:
+    """A chain of installer commands; run_parallel multiplexes the output of several."""
+    name: str
+    cmds: list                       # argv lists, or callables returning one at launch
+    env: Optional[dict] = None
+    done: int = 0                    # commands that finished successfully
+    proc: Optional[subprocess.Popen] = None
+    tail: deque = field(default_factory=lambda: deque(maxlen=20))
+    buf: bytes = b""
+
+
+def run_parallel(jobs, timeout=1800):
+    """Run jobs side by side, one selector over all pipes; a chain stops at its first failure."""
+    import selectors
+    sel = selectors.DefaultSelector()
+    deadline = time.monotonic() + timeout
+
+    def emit(job, line):
+        text = line.decode(errors="replace").rstrip("\r")
+        job.tail.append(text)
+        print(f"  {GR}[{job.name}]{D} {text}", flush=True)
+
+    def launch(job):
+        cmd = job.cmds[job.done]
+        cmd = cmd() if callable(cmd) else cmd
+        try:
+            job.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0,
+                                        env={**os.environ, **job.env} if job.env else None)
+        except OSError as e:
+            emit(job, f"{cmd[0]}: {e}".encode())
+            return
+        sel.register(job.proc.stdout, selectors.EVENT_READ, job)
+
+    for job in jobs:
+        launch(job)
+    while sel.get_map():
+        if time.monotonic() > deadline:
+            for key in sel.get_map().values():
+                emit(key.data, b"timed out, stopping")
+                key.data.proc.kill()
+            deadline = float("inf")
+        for key, _ in sel.select(timeout=0.1):
+            job = key.data
+            chunk = os.read(key.fd, 65536)
+            if chunk:
+                *lines, job.buf = (job.buf + chunk).split(b"\n")
+                for line in lines:
+                    emit(job, line)
+                continue
+            sel.unregister(key.fileobj)
+            key.fileobj.close()
+            if job.buf:
+                emit(job, job.buf)
+                job.buf = b""
+            if job.proc.wait() == 0:
+                job.done += 1
+                if job.done < len(job.cmds):
+                    launch(job)
+    sel.close()
+
+
+def run_installs(brew, deps, kismet):
+    """Run the network-bound installers concurrently; brew steps stay serialized."""
+    if not (brew or kismet or deps["create_venv"] or deps["install"]):
+        return
+    h("Installing — Homebrew, Python packages and Kismet run in parallel")
+
+    if deps["create_venv"] and not create_venv():
+        deps["use_venv"] = False
+
+    jobs = []
+    if brew or kismet:
+        # Kismet comes from Homebrew, so it waits for the Homebrew install in the same chain
+        cmds = [HOMEBREW_INSTALL] if brew else []
+        if kismet:
+            cmds.append(lambda: [brew_path(), "install", "--force-bottle", "kismet"])
+        brew_job = ParallelInstallJob("brew", cmds, BREW_ENV)
+        jobs.append(brew_job)
+        if brew:
+            print(f"\n  {C}Installing Homebrew (this may ask for your password)…{D}")
+        if kismet:
+            print(f"\n  {C}Running: brew install kismet…{D}")
+    if deps["install"]:
+        install, pip_cmd = pip_install_cmd(deps["use_venv"])
+        if install[0] == "uv":
+            info("Using uv for package installs")
+        # One resolver run for the whole file; pips with parallel downloads read the env var
+        pip_job = ParallelInstallJob("pip", [[*install, "-r", REQ_FILE]], PIP_ENV)
+        jobs.append(pip_job)
+        print(f"\n  {C}Installing dependencies — this may take 30–90 seconds…{D}")
+    print()
+
+    run_parallel(jobs)
+
+    if brew:
+        has_command.cache_clear()
+        if brew_job.done:
+            ok("Homebrew installed successfully")
+        else:
+            warn("Homebrew install had issues. Try manually: https://brew.sh")
+    if kismet:
+        if kismet_installed():
+            ok("Kismet installed successfully!")
+        else:
+            warn("Kismet install may have issues. Check brew output.")
+    if deps["install"]:
+        if pip_job.done:
+            ok("All Python packages installed successfully ✨")
+            success = True
+        else:
+            success = retry_packages(install, pip_cmd)
+        if success and deps["use_venv"]:
+            save_requirements_hash()
+
+
+# ══════════════════════════════════════════════
+#  STEP 6: Save + Desktop Launcher
+# ══════════════════════════════════════════════
+def save_config(cfg):
+    """Atomically replace config.json, owner-only since it holds API credentials."""
+    if HAS_ORJSON:
+        data = orjson.dumps(cfg, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(cfg, indent=2).encode()
+    tmp = CONFIG_PATH + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, 0o600)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp)
+        raise
+    os.close(fd)
+    os.replace(tmp, CONFIG_PATH)
+
+
+# Desktop launcher; {repo} and {venv} (the activate script) are filled in by step_finish
+_LAUNCHER_TMPL = """#!/bin/bash
 # SentinelWatch — One-Click Desktop Launcher
 # Created by setup_wizard.py
-cd "{REPO_DIR}"
+cd "{repo}"
 
 # Activate virtual environment
-if [ -f "{venv_activate}" ]; then
-    source "{venv_activate}"
+if [ -f "{venv}" ]; then
+    source "{venv}"
     echo "✓ Virtual environment activated"
 fi
 
-# Quick dependency check
-python3 -c "import flask" 2>/dev/null || {{
-    echo "⚠  Dependencies missing — installing now..."
-    pip install -r requirements.txt
-}}
-
 echo ""
 echo "╔══════════════════════════════════════╗"
 echo "║  🛡  SentinelWatch is starting...   ║"
@@ -323,15 +692,22 @@ echo "║      http://localhost:8888           ║"
 echo "╚══════════════════════════════════════╝"
 echo ""
 
-(sleep 1.5 && open "http://localhost:8888") &
+# Open the browser once the server is actually listening (give up after 5 min)
+(for _ in $(seq 3000); do
+    nc -z localhost 8888 2>/dev/null && {{ open "http://localhost:8888"; break; }}
+    sleep 0.1
+done) &
+
+# web_ui.py exits with 3 when a dependency is missing
 python3 web_ui.py
+if [ $? -eq 3 ]; then
+    echo "⚠  Dependencies missing — installing now..."
+    pip install -r requirements.txt && exec python3 web_ui.py
+fi
 """
-    with open(desktop, "w") as f:
-        f.write(script)
-    desktop.chmod(0o755)
-    ok(f"Desktop launcher created: ~/Desktop/SentinelWatch.command")
 
-    print(f"""
+
+_DONE = f"""
 {B}{G}
   ╔══════════════════════════════════════════════════╗
   ║  ✅  SentinelWatch Setup Complete!              ║
@@ -349,7 +725,30 @@ python3 web_ui.py
     {C}./start.sh stalker{D}    → Multi-location GPS stalker ranking
 
   {B}Re-run wizard:{D}  {C}python3 setup_wizard.py{D}
-""")
+
+""".encode()
+
+
+def step_finish(cfg):
+    h("Step 6 of 6 — Save & Create Desktop Launcher")
+
+    # Save config
+    save_config(cfg)
+    ok(f"Config saved → {CONFIG_PATH}")
+
+    # Desktop launcher
+    desktop = LAUNCHER_PATH
+    script = _LAUNCHER_TMPL.format(repo=REPO_DIR, venv=os.path.join(VENV_BIN, "activate")).encode()
+    existing = desktop.read_bytes() if desktop.exists() else b""
+    if existing != script:
+        # Rewrite only on change so Spotlight/backups don't see a new mtime every run
+        desktop.write_bytes(script)
+        desktop.chmod(0o755)
+        ok(f"Desktop launcher created: ~/Desktop/SentinelWatch.command")
+    else:
+        ok(f"Desktop launcher up to date: ~/Desktop/SentinelWatch.command")
+
+    write_block(_DONE)
 
 
 # ══════════════════════════════════════════════
@@ -363,18 +762,21 @@ def main():
 
     # Load config
     try:
-        with open(CONFIG_PATH) as f:
-            cfg = json.load(f)
+        with open(CONFIG_PATH, "rb") as f:
+            cfg = _json_loads(f.read())
     except Exception:
         err(f"Could not load {CONFIG_PATH}")
         sys.exit(1)
 
     try:
-        step_homebrew()
-        step_dependencies()
-        step_kismet_install()
+        brew = step_homebrew()
+        deps = step_dependencies()
+        kismet, migrate = step_kismet_install(brew_planned=brew)
         step_kismet_config(cfg)
         step_notifications(cfg)
+        run_installs(brew, deps, kismet)
+        if migrate:
+            run_migration()
         step_finish(cfg)
     except KeyboardInterrupt:
         print(f"\n\n  {Y}Setup cancelled. Run again anytime: python3 setup_wizard.py{D}\n")
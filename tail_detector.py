@@ -4,23 +4,61 @@ Surveillance detection system for macOS using Kismet as a backend.
 🔒 SECURE MODE: Uses SecureKismetDB for SQL injection prevention.
 """
 
+import fnmatch
+import atexit
 import glob
+import heapq
 import json
+import math
+import operator
 import os
 import sqlite3
 import smtplib
 import subprocess
+import sys
 from secure_database import SecureKismetDB
 import csv
+import ctypes
+import ctypes.util
+import functools
 import threading
 import time
 import platform
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, timedelta
+import queue
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import MISSING, dataclass, field, fields
+from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from itertools import chain, count, islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+# Try numpy for vectorized sweep scoring, fall back to per-profile scoring
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# Try orjson for faster JSON parse/serialize (device blobs + whitelist)
+try:
+    import orjson
+    HAS_ORJSON = True
+    _json_loads = orjson.loads
+except ImportError:
+    HAS_ORJSON = False
+    _json_loads = json.loads
+
+# Try watchdog to wake sweeps on .kismet writes, fall back to fixed-interval sleeps
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
 
 # Try colorama, fall back to ANSI
 try:
@@ -74,35 +112,245 @@ KNOWN_OUI = {
     "2c:aa:8e": "Ring",     "00:04:4b": "Nvidia",
 }
 
+# Same table keyed by the 24-bit OUI value, so lookups hash an int rather than a sliced string
+_OUI_INT = {int(k.replace(":", ""), 16): v for k, v in KNOWN_OUI.items()}
+
+
+def _oui_int(mac: str) -> Optional[int]:
+    """24-bit OUI of an "aa:bb:cc:..." MAC, or None if it isn't in that form."""
+    if len(mac) < 8 or mac[2] != ":" or mac[5] != ":":
+        return None
+    try:
+        return int.from_bytes(bytes.fromhex(mac[0:2] + mac[3:5] + mac[6:8]), "big")
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=65536)
 def lookup_manufacturer(mac: str) -> str:
-    return KNOWN_OUI.get(mac[:8].lower(), "Unknown")
+    """
+    Vendor for a MAC in any case ("AA:BB:CC:..." or "aa:bb:cc:..."); the hex decode
+    needs no lowercased copy. Cached per MAC, since the same devices repeat across rows and sweeps.
+    """
+    return _OUI_INT.get(_oui_int(mac), "Unknown")
 
 
 # ──────────────────────────────────────────────
 #  Global alert queue for SSE
 # ──────────────────────────────────────────────
-_alert_queue: list = []
-_alert_lock = threading.Lock()
+# Bounded: appending past maxlen drops the oldest alert in O(1). _push_alert
+# appends to both deques and bumps _alert_seq under _alert_cond, which also
+# wakes wait_for_alerts. Readers going through _alert_tail take no lock: each
+# deque.copy is atomic, but the two deques are copied separately and can
+# briefly differ in length by an alert.
+_alert_queue: deque = deque(maxlen=200)
+# The same alerts JSON-encoded once at push time, for routes that send them as-is
+_alert_json: deque = deque(maxlen=200)
+# Alerts pushed since import; consumers track the last number they saw (see wait_for_alerts)
+_alert_seq = 0
+_alert_cond = threading.Condition()
+
+# Canonical trend label objects, so profiles share them rather than numpy-derived copies
+_TRENDS = {t: t for t in ("unknown", "approaching", "receding", "stable")}
+
+_SSID_MAP_KEYS = ("dot11.device.probed_ssid_map", "dot11.device.advertised_ssid_map")
+
+# Conservative bound on sqlite host parameters (SQLITE_MAX_VARIABLE_NUMBER
+# was 999 before sqlite 3.32); one slot is left for the last_time cutoff
+_SQL_MAX_PARAMS = 999
 
 def _push_alert(level: str, message: str):
-    with _alert_lock:
-        _alert_queue.append({
-            "level": level,
-            "message": message,
-            "timestamp": datetime.now().isoformat()
-        })
-        if len(_alert_queue) > 200:
-            _alert_queue.pop(0)
+    global _alert_seq
+    alert = {
+        "level": level,
+        "message": message,
+        "timestamp": datetime.now().isoformat()
+    }
+    encoded = orjson.dumps(alert) if HAS_ORJSON else json.dumps(alert).encode()
+    with _alert_cond:
+        _alert_queue.append(alert)
+        _alert_json.append(encoded)
+        _alert_seq += 1
+        _alert_cond.notify_all()
+
+def _alert_tail(buf: deque, limit: int) -> list:
+    snap = buf.copy()
+    # Same window as list[-limit:]
+    start = max(0, len(snap) - limit) if limit > 0 else min(len(snap), -limit)
+    return list(islice(snap, start, None))
 
 def get_recent_alerts(limit: int = 50) -> list:
-    with _alert_lock:
-        return list(_alert_queue[-limit:])
+    return _alert_tail(_alert_queue, limit)
+
+def get_recent_alerts_json(limit: int = 50) -> list[bytes]:
+    """Like get_recent_alerts, but each alert already serialized to JSON bytes."""
+    return _alert_tail(_alert_json, limit)
+
+def wait_for_alerts(seen: int, timeout: Optional[float] = None) -> tuple[int, list]:
+    """
+    Block until an alert newer than sequence number `seen` is pushed (or `timeout`).
+    Returns (latest sequence number, the newer alerts still in the buffer).
+    """
+    with _alert_cond:
+        _alert_cond.wait_for(lambda: _alert_seq > seen, timeout)
+        n = min(_alert_seq - seen, len(_alert_queue))
+        return _alert_seq, list(islice(_alert_queue, len(_alert_queue) - n, None))
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Source of DeviceProfile._api_gen values; next() on a count is atomic under the GIL,
+# so concurrent invalidations never hand out the same generation twice
+_api_generations = count(1)
+
+
+def _intern(s):
+    """sys.intern for strings, pass-through otherwise. Used for the few distinct manufacturer/mode values."""
+    return sys.intern(s) if type(s) is str else s
+
+
+@functools.lru_cache(maxsize=8192)
+def _iso_ts(iso: str) -> Optional[float]:
+    """Naive-epoch seconds for a last_seen ISO string (None if unparseable); cached across sweeps."""
+    try:
+        return (datetime.fromisoformat(iso) - _EPOCH).total_seconds()
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _ts_iso(ts) -> str:
+    """datetime.fromtimestamp(ts).isoformat(), cached since a device's last_time repeats across sweeps."""
+    return datetime.fromtimestamp(ts).isoformat()
+
+
+def _scan_files(pattern: str) -> list[tuple[str, float]]:
+    """(path, mtime) for each file matching a glob pattern; one os.scandir pass when only the basename has wildcards."""
+    dirname, base = os.path.split(pattern)
+    if glob.has_magic(dirname) or not glob.has_magic(base):
+        out = []
+        for path in glob.glob(pattern):
+            try:
+                out.append((path, os.path.getmtime(path)))
+            except OSError:
+                pass
+        return out
+    out = []
+    try:
+        with os.scandir(dirname or os.curdir) as it:
+            for e in it:
+                # Same matches as glob (dotfiles only for dot patterns), minus directories
+                if e.name.startswith(".") and not base.startswith("."):
+                    continue
+                if fnmatch.fnmatch(e.name, base) and e.is_file():
+                    out.append((os.path.join(dirname, e.name), e.stat().st_mtime))
+    except OSError:
+        pass
+    return out
+
+
+@functools.lru_cache(maxsize=64)
+def _critical_box(w: int) -> tuple[str, str, str]:
+    """Top border, title row and bottom border of a CRITICAL console box `w` columns wide."""
+    b = "─" * w
+    return (f"\n{_RED}{_BOLD}┌{b}┐", f"│  ⚠  CRITICAL ALERT{' '*(w-19)}│", f"└{b}┘{_RESET}\n")
+
+
+def _dir_stamps(dirs: tuple) -> Optional[tuple]:
+    """st_mtime_ns of each directory (changes when entries are added/removed/renamed); None if any is missing."""
+    try:
+        return tuple(os.stat(d).st_mtime_ns for d in dirs)
+    except OSError:
+        return None
+
+
+def _restat(entries: list) -> list[tuple[str, float]]:
+    """Refresh the mtimes of (path, mtime) entries, dropping files that have gone."""
+    out = []
+    for path, _ in entries:
+        try:
+            out.append((path, os.stat(path).st_mtime))
+        except OSError:
+            pass
+    return out
+
+
+_score_key = operator.attrgetter("encounter_score")
+
+
+# (iokit, corefoundation, IOHIDSystem service, "HIDIdleTime" CFString) once loaded; False if unavailable
+_IOKIT = None
+
+
+def _load_iokit():
+    if platform.system() != "Darwin":
+        return False
+    try:
+        iokit = ctypes.CDLL(ctypes.util.find_library("IOKit"))
+        cf = ctypes.CDLL(ctypes.util.find_library("CoreFoundation"))
+        iokit.IOServiceMatching.restype = ctypes.c_void_p
+        iokit.IOServiceMatching.argtypes = [ctypes.c_char_p]
+        iokit.IOServiceGetMatchingService.restype = ctypes.c_uint32
+        iokit.IOServiceGetMatchingService.argtypes = [ctypes.c_uint32, ctypes.c_void_p]
+        iokit.IORegistryEntryCreateCFProperty.restype = ctypes.c_void_p
+        iokit.IORegistryEntryCreateCFProperty.argtypes = [ctypes.c_uint32, ctypes.c_void_p,
+                                                          ctypes.c_void_p, ctypes.c_uint32]
+        cf.CFStringCreateWithCString.restype = ctypes.c_void_p
+        cf.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
+        cf.CFNumberGetValue.restype = ctypes.c_bool
+        cf.CFNumberGetValue.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p]
+        cf.CFRelease.argtypes = [ctypes.c_void_p]
+        # Default master port (0); the matching dict is consumed by the call
+        service = iokit.IOServiceGetMatchingService(0, iokit.IOServiceMatching(b"IOHIDSystem"))
+        key = cf.CFStringCreateWithCString(None, b"HIDIdleTime", 0x08000100)  # kCFStringEncodingUTF8
+        if not service or not key:
+            return False
+        return iokit, cf, service, key
+    except (OSError, AttributeError, TypeError):
+        return False
+
+
+def _iokit_idle_time() -> Optional[float]:
+    """macOS HID idle seconds read from IOKit in-process; None where IOKit is unavailable."""
+    global _IOKIT
+    if _IOKIT is None:
+        _IOKIT = _load_iokit()
+    if not _IOKIT:
+        return None
+    iokit, cf, service, key = _IOKIT
+    prop = iokit.IORegistryEntryCreateCFProperty(service, key, None, 0)
+    if not prop:
+        return None
+    try:
+        ns = ctypes.c_int64()
+        if not cf.CFNumberGetValue(prop, 4, ctypes.byref(ns)):  # kCFNumberSInt64Type
+            return None
+        return ns.value / 1e9
+    finally:
+        cf.CFRelease(prop)
+
+
+def _write_profiles(filename: str, devices: dict):
+    """Write {mac: DeviceProfile} as indented JSON; orjson serializes the dataclasses directly (deques as lists)."""
+    if HAS_ORJSON:
+        Path(filename).write_bytes(orjson.dumps(devices, option=orjson.OPT_INDENT_2, default=list))
+    else:
+        with open(filename, "w") as f:
+            json.dump({mac: p.to_dict() for mac, p in devices.items()}, f, indent=2)
 
 
 # ──────────────────────────────────────────────
 #  DeviceProfile
 # ──────────────────────────────────────────────
-@dataclass
+SIGNAL_HISTORY_LEN = 20
+
+# DeviceProfile._mode_bits flags mirroring modes_seen_in
+MODE_STATIONARY = 1
+MODE_ROAMING = 2
+_MODE_BITS = {"STATIONARY": MODE_STATIONARY, "ROAMING": MODE_ROAMING}
+
+# Slotted where supported (3.10+): no per-instance __dict__ across thousands of profiles
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class DeviceProfile:
     mac: str
     label: str = ""
@@ -115,7 +363,7 @@ class DeviceProfile:
     home_encounters: int = 0
     roam_encounters: int = 0
     encounter_score: float = 0.0
-    signal_history: list = field(default_factory=list)
+    signal_history: deque = field(default_factory=lambda: deque(maxlen=SIGNAL_HISTORY_LEN))
     signal_trend: str = "unknown"
     modes_seen_in: list = field(default_factory=list)
     notes: str = ""
@@ -123,45 +371,156 @@ class DeviceProfile:
     cross_mode_detected: bool = False
     # Linger tracking (doorbell / home)
     first_seen_this_session: str = ""
+    # MODE_* bits of modes_seen_in for cheap membership tests; private, so never serialized
+    _mode_bits: int = field(default=0, init=False, repr=False, compare=False)
+    # (generation, to_api_dict() result); only valid while the generation still matches
+    # _api_gen, which TailDetector._drop_api_dict renews after it mutates the profile
+    _api_dict: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _api_gen: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Loaded/explicit histories arrive as lists; keep only the newest samples
+        if not (isinstance(self.signal_history, deque) and self.signal_history.maxlen == SIGNAL_HISTORY_LEN):
+            self.signal_history = deque(self.signal_history or (), maxlen=SIGNAL_HISTORY_LEN)
+        if isinstance(self.modes_seen_in, list):
+            for m in self.modes_seen_in:
+                self._mode_bits |= _MODE_BITS.get(m, 0)
 
     def display_name(self) -> str:
         return self.label if self.label else self.mac
 
-    def to_dict(self) -> dict:
-        return asdict(self)
+    def to_api_dict(self) -> dict:
+        """to_dict() plus display_name and signal_latest for the dashboard, cached. Treat as read-only."""
+        # A dict built while a sweep writes is stored under the generation read first,
+        # so the sweep's later _drop_api_dict leaves it unused rather than stale
+        gen = self._api_gen
+        cached = self._api_dict
+        if cached is not None and cached[0] == gen:
+            return cached[1]
+        d = self.to_dict() | {
+            "display_name": self.display_name(),
+            "signal_latest": self.signal_history[-1] if self.signal_history else None,
+        }
+        self._api_dict = (gen, d)
+        return d
+
+    # to_dict is generated below the class, once its fields are known
 
     @classmethod
     def from_dict(cls, d: dict) -> "DeviceProfile":
-        valid = set(cls.__dataclass_fields__.keys())
-        return cls(**{k: v for k, v in d.items() if k in valid})
+        p = cls(**{k: d[k] for k in _PROFILE_FIELDS if k in d})
+        p.manufacturer = _intern(p.manufacturer)
+        if isinstance(p.modes_seen_in, list):
+            p.modes_seen_in = [_intern(m) for m in p.modes_seen_in]
+        return p
+
+
+_PROFILE_FIELDS = tuple(k for k in DeviceProfile.__dataclass_fields__ if not k.startswith("_"))
+
+
+def _gen_to_dict(cls) -> None:
+    """
+    Compile cls.to_dict as a single dict literal over the public dataclass fields, in
+    field order like asdict. Container fields (those with a default_factory) are copied
+    to plain lists; their items are str/int, so that matches asdict's deep copy.
+    """
+    items = ", ".join(
+        f"{f.name!r}: list(self.{f.name})" if f.default_factory is not MISSING
+        else f"{f.name!r}: self.{f.name}"
+        for f in fields(cls) if not f.name.startswith("_")
+    )
+    ns: dict = {}
+    exec(f"def to_dict(self) -> dict:\n    return {{{items}}}\n", ns)
+    to_dict = ns["to_dict"]
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    cls.to_dict = to_dict
+
+
+_gen_to_dict(DeviceProfile)
+
+
+def _is_unknown(p: DeviceProfile) -> bool:
+    """Counted in TailDetector.unknown_count: unlabeled and never seen in HOME mode."""
+    return not p.label and "HOME" not in p.modes_seen_in
 
 
 # ──────────────────────────────────────────────
 #  TailDetector
 # ──────────────────────────────────────────────
+# Seconds an identical alert stays off the log and console after being shown
+ALERT_REPEAT_WINDOW = 30
+# Most MACs remembered as already linger-alerted (oldest forgotten first)
+LINGER_ALERTED_MAX = 1024
+# Least seconds between event-driven sweeps; Kismet rewrites its log every few seconds
+KISMET_MIN_RESCAN = 5
+
+
+if HAS_WATCHDOG:
+    class _KismetChangeHandler(FileSystemEventHandler):
+        """Sets `changed` whenever a .kismet file is created or written."""
+
+        def __init__(self, changed: threading.Event):
+            self.changed = changed
+
+        def on_any_event(self, event):
+            if not event.is_directory and event.src_path.endswith(".kismet"):
+                self.changed.set()
+
 class TailDetector:
     def __init__(self, config_path: str = "config.json"):
         with open(config_path, "r") as f:
-            self.config = json.load(f)
+            config = json.load(f)
 
         self.config_path = config_path
+        # fire_alert state: log lines queued for the writer thread (which alone owns
+        # the log handle) and (level, message) → monotonic time last written, for
+        # repeat suppression
+        self._alert_fh = None
+        self._alert_lines: "queue.Queue[str]" = queue.Queue()
+        self._alert_writer: Optional[threading.Thread] = None
+        self._recent_alerts: dict[tuple, float] = {}
+        self._alert_io_lock = threading.Lock()
+        # Queued alert lines reach the log before the interpreter exits
+        atexit.register(self.flush_alert_log)
+        self.apply_config(config)
         self.whitelist_path = self.config["paths"]["whitelist"]
         self.alerts_log = self.config["paths"]["alerts_log"]
         self.kismet_glob = self.config["paths"]["kismet_logs"]
-        self.thresholds = self.config["thresholds"]
-        self.alert_cfg = self.config["alerts"]
-        self.timing = self.config["timing"]
 
-        # Linger tracking: mac → datetime first seen this session
-        self._linger_first_seen: dict[str, datetime] = {}
-        self._linger_alerted: set = set()
+        # (pattern, monotonic time, [(path, mtime)]) from the last Kismet directory scan
+        self._kismet_files_cache: Optional[tuple] = None
+        self._kismet_changed = threading.Event()
+        self._kismet_observer = None
+        self._watched_dirs: set = set()
+        # Ends the running mode loop (see stop_mode). Each run_*_mode holds on to the
+        # event it started with, so replacing it for the next mode can't revive the old loop.
+        self.stop_event = threading.Event()
+
+        # Linger tracking: mac → time.monotonic() first seen this session
+        self._linger_first_seen: dict[str, float] = {}
+        # Already-alerted MACs, LRU-bounded to LINGER_ALERTED_MAX
+        self._linger_alerted: OrderedDict[str, None] = OrderedDict()
+        self._linger_pruned_at = time.monotonic()
 
         os.makedirs(os.path.dirname(self.whitelist_path), exist_ok=True)
         os.makedirs(os.path.dirname(self.alerts_log), exist_ok=True)
         os.makedirs(self.config["paths"]["log_dir"], exist_ok=True)
 
         self.devices: dict[str, DeviceProfile] = {}
+        # Profiles with no label and never seen in HOME mode (the dashboard's "unknown"),
+        # kept current wherever a profile is added or its label/modes change
+        self.unknown_count = 0
+        # MACs of watchlisted devices (flag or group), insertion-ordered
+        self._watchlist_macs: dict[str, None] = {}
+        # Bumped whenever the watchlist or a watchlisted profile's dashboard dict changes
+        self.watchlist_version = 0
+        # MACs changed since the whitelist was last written; _save_whitelist is a no-op when empty
+        self._dirty: set[str] = set()
         self.current_mode: str = "IDLE"
+        # db_path → {devmac: (last_time, manufacturer, ssids)} from parsed device blobs
+        self._parse_cache: dict[str, dict[str, tuple]] = {}
+        # sweep kind → {mac: (last_time already processed, time.monotonic() its sweep started)}; see _unchanged
+        self._sweep_last_time: dict[str, dict[str, tuple]] = {}
         self.present_macs: set = set()
 
         self._load_whitelist()
@@ -173,22 +532,41 @@ class TailDetector:
         except ImportError:
             self._notif = None
 
+    def apply_config(self, config: dict):
+        """Adopt a (re)loaded config, resolving the settings hot loops read into attributes."""
+        self.config = config
+        self.thresholds = config["thresholds"]
+        self.alert_cfg = config["alerts"]
+        self.timing = config["timing"]
+
+        self._approach_thresh = self.thresholds.get("signal_approaching_threshold", -65)
+        self._linger_minutes = self.timing.get("unknown_ssid_linger_minutes", 5)
+        self._doorbell_interval = self.timing.get("doorbell_scan_interval", 10)
+        self._roam_interval = self.timing.get("roam_scan_interval", 15)
+        self._log_alerts = self.alert_cfg.get("log_alerts", True)
+        self._console_alerts = self.alert_cfg.get("console_alerts", True)
+        # Kismet file listings are reused for half the shortest scan interval
+        self._kismet_files_ttl = min(self._doorbell_interval, self._roam_interval) / 2
+
     # ─── Whitelist ────────────────────────────
     def _load_whitelist(self):
         if os.path.exists(self.whitelist_path):
             try:
-                with open(self.whitelist_path, "r") as f:
-                    data = json.load(f)
+                data = _json_loads(Path(self.whitelist_path).read_bytes())
                 for mac, d in data.items():
-                    self.devices[mac] = DeviceProfile.from_dict(d)
+                    p = self.devices[mac] = DeviceProfile.from_dict(d)
+                    self.unknown_count += _is_unknown(p)
+                    self._index_watchlist(mac)
             except Exception as e:
                 self.fire_alert("WARNING", f"Could not load whitelist: {e}")
 
     def _save_whitelist(self):
+        if not self._dirty:
+            return
         try:
             os.makedirs(os.path.dirname(self.whitelist_path), exist_ok=True)
-            with open(self.whitelist_path, "w") as f:
-                json.dump({mac: p.to_dict() for mac, p in self.devices.items()}, f, indent=2)
+            _write_profiles(self.whitelist_path, self.devices)
+            self._dirty.clear()
         except Exception as e:
             self.fire_alert("WARNING", f"Could not save whitelist: {e}")
 
@@ -198,141 +576,337 @@ class TailDetector:
         pattern = self.config["paths"]["kismet_logs"]
         if pattern.startswith("~"):
             pattern = os.path.expanduser(pattern)
-            
-        files = glob.glob(pattern)
-        
-        # Fallback 1: Home directory
-        if not files:
-            files = glob.glob(os.path.join(str(Path.home()), "*.kismet"))
-            
-        # Fallback 2: Linux standard path
-        if not files and platform.system() == "Linux":
-            files = glob.glob("/var/lib/kismet/*.kismet")
-            
+
+        cached = self._kismet_files_cache
+        mono = time.monotonic()
+        if cached and cached[0] == pattern and mono - cached[1] < self._kismet_files_ttl:
+            entries = cached[2]
+        elif cached and cached[0] == pattern and cached[3] and _dir_stamps(cached[3]) == cached[4]:
+            # Same directory listings as last scan: only the logs' mtimes can have moved
+            entries = _restat(cached[2])
+            self._kismet_files_cache = (pattern, mono, entries, cached[3], cached[4])
+        else:
+            # Directories are stamped before they are listed, so a log created mid-scan
+            # invalidates the cache rather than hiding behind an up-to-date stamp
+            dirs: list[str] = []
+            stamps: list = []
+
+            def scan(pat: str) -> list:
+                d = os.path.dirname(pat) or os.curdir
+                dirs.append(d)
+                stamps.append(None if glob.has_magic(d) else _dir_stamps((d,)))
+                return _scan_files(pat)
+
+            entries = scan(pattern)
+
+            # Fallback 1: Home directory
+            if not entries:
+                entries = scan(os.path.join(str(Path.home()), "*.kismet"))
+
+            # Fallback 2: Linux standard path
+            if not entries and platform.system() == "Linux":
+                entries = scan("/var/lib/kismet/*.kismet")
+
+            # Directory mtimes only vouch for listings of plain, existing directories
+            if None in stamps:
+                dirs, stamps = [], []
+            self._kismet_files_cache = (pattern, mono, entries, tuple(dirs),
+                                        tuple(st for (st,) in stamps))
+            if HAS_WATCHDOG:
+                self._watch_dirs({os.path.dirname(path) for path, _ in entries})
+
         if hours is not None:
-            cutoff = datetime.now() - timedelta(hours=hours)
-            files = [f for f in files
-                     if datetime.fromtimestamp(os.path.getmtime(f)) >= cutoff]
-        return sorted(files)
+            cutoff = time.time() - hours * 3600
+            return sorted(path for path, mtime in entries if mtime >= cutoff)
+        return sorted(path for path, _ in entries)
+
+    def _watch_dirs(self, dirs: set):
+        """Add the directories holding Kismet logs to the watchdog observer (started on first use)."""
+        new = dirs - self._watched_dirs
+        if not new:
+            return
+        try:
+            if self._kismet_observer is None:
+                self._kismet_observer = Observer()
+                self._kismet_observer.daemon = True
+                self._kismet_observer.start()
+            handler = _KismetChangeHandler(self._kismet_changed)
+            for d in new:
+                self._kismet_observer.schedule(handler, d or ".", recursive=False)
+                self._watched_dirs.add(d)
+        except Exception as e:
+            self.fire_alert("WARNING", f"Kismet log watch failed, polling instead: {e}")
 
-    def _parse_kismet_db(self, db_path: str) -> list[dict]:
-        """🔒 Secure: uses parameterized SecureKismetDB — no raw SQL concatenation."""
+    def _wait_for_kismet(self, interval: float, stop: threading.Event):
+        """
+        Sleep until the next sweep: as soon as a watched .kismet log changes (but no
+        sooner than KISMET_MIN_RESCAN), else after `interval` as without watchdog.
+        Returns early once `stop` is set. An early sweep picks up newly seen devices;
+        callers pass `interval` to _unchanged so known ones are still folded in (and
+        their encounters counted) at most once per interval.
+        """
+        if not self._watched_dirs:
+            stop.wait(interval)
+            return
+        gap = min(KISMET_MIN_RESCAN, interval)
+        if stop.wait(gap):
+            return
+        # stop_mode also sets _kismet_changed, so this wait ends promptly too
+        self._kismet_changed.wait(interval - gap)
+        self._kismet_changed.clear()
+
+    def stop_mode(self):
+        """Ask the running mode loop to return; it exits at its next check, without finishing its sleep."""
+        self.stop_event.set()
+        self._kismet_changed.set()
+
+    def _parse_kismet_db(self, db_path: str, since: Optional[float] = None,
+                         macs: Optional[set] = None, blobs: bool = True) -> list[dict]:
+        """
+        🔒 Secure: uses parameterized SecureKismetDB — no raw SQL concatenation.
+        since: only rows with last_time >= since (epoch seconds).
+        macs: only these devmacs. Both filters run in SQLite, so skipped rows are never json-parsed.
+        blobs: False skips the device blobs entirely; ssids/manufacturer are then None.
+        """
         devices = []
+        # The device blob is fetched separately, only for rows the parse cache can't answer
+        sql = ("SELECT rowid, devmac, type, first_time, last_time, "
+               "avg_lat, avg_lon, strongest_signal FROM devices")
+        where, params = [], ()
+        if since is not None:
+            where.append("last_time >= ?")
+            params = (since,)
+        if macs is None:
+            queries = [(sql + (" WHERE " + " AND ".join(where) if where else ""), params)]
+        else:
+            ordered = sorted(macs)
+            step = _SQL_MAX_PARAMS - 1
+            queries = []
+            for i in range(0, len(ordered), step):
+                batch = ordered[i:i + step]
+                clause = " AND ".join(where + ["devmac IN ({})".format(",".join("?" * len(batch)))])
+                queries.append((sql + " WHERE " + clause, params + tuple(batch)))
         try:
             with SecureKismetDB(db_path) as db:
                 if not db.validate_connection():
                     self.fire_alert("WARNING", f"DB validation failed: {db_path}")
                     return []
-                rows = db.execute_safe_query(
-                    "SELECT devmac, type, device, first_time, last_time, "
-                    "avg_lat, avg_lon, strongest_signal FROM devices"
-                )
-                for row in rows:
-                    try:
-                        blob = json.loads(row["device"]) if row["device"] else {}
-                        ssids = self._extract_ssids(blob)
-                        devices.append({
-                            "mac": row["devmac"],
-                            "type": row["type"],
-                            "first_time": row["first_time"],
-                            "last_time": row["last_time"],
-                            "avg_lat": row["avg_lat"],
-                            "avg_lon": row["avg_lon"],
-                            "signal": row["strongest_signal"],
-                            "ssids": ssids,
-                            "manufacturer": blob.get("kismet.device.base.manuf", "")
-                                           or lookup_manufacturer(row["devmac"]),
-                        })
-                    except Exception:
-                        pass
+                cache = self._parse_cache.setdefault(db_path, {})
+                # Row and blob queries share one read lock and a consistent snapshot
+                with db.read_transaction():
+                    for query, qparams in queries:
+                        rows = chain.from_iterable(db.execute_safe_query_iter(query, qparams, tuples=True))
+                        self._parse_rows(db, rows, devices, cache, blobs)
         except Exception as e:
             self.fire_alert("WARNING", f"DB parse error {db_path}: {e}")
         return devices
 
+    def _parse_kismet_dbs(self, files: list[str], **filters) -> Iterator[list[dict]]:
+        """
+        _parse_kismet_db for each file, yielded in file order. Files are read on a
+        thread pool (SQLite releases the GIL while reading); callers merge the results
+        on their own thread, so profiles are only ever mutated there.
+        """
+        # Parse caches of logs that left the scan window are dropped
+        for db_path in self._parse_cache.keys() - set(files):
+            del self._parse_cache[db_path]
+        if len(files) < 2:
+            for db_path in files:
+                yield self._parse_kismet_db(db_path, **filters)
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as ex:
+            yield from ex.map(functools.partial(self._parse_kismet_db, **filters), files)
+
+    def _parse_rows(self, db: SecureKismetDB, rows, devices: list, cache: dict, blobs: bool = True):
+        """
+        Append one raw device dict per (rowid, devmac, type, ...) row tuple. SSIDs and
+        manufacturer come from `cache` (devmac → (last_time, manufacturer, ssids)) while
+        the row's last_time is unchanged; other rows have their blobs fetched and parsed
+        (unless `blobs` is False, which leaves both None).
+        """
+        start = len(devices)
+        pending: dict[int, dict] = {}
+        append, get = devices.append, cache.get
+        for (rowid, devmac, dtype, first_time, last_time,
+             avg_lat, avg_lon, signal) in rows:
+            raw = {
+                "mac": devmac,
+                "type": dtype,
+                "first_time": first_time,
+                "last_time": last_time,
+                "avg_lat": avg_lat,
+                "avg_lon": avg_lon,
+                "signal": signal,
+                "ssids": None,
+                "manufacturer": None,
+            }
+            if blobs:
+                hit = get(devmac)
+                if hit is not None and hit[0] == last_time:
+                    raw["manufacturer"], raw["ssids"] = hit[1], list(hit[2])
+                else:
+                    pending[rowid] = raw
+            append(raw)
+        if not pending:
+            return
+
+        rowids = list(pending)
+        for i in range(0, len(rowids), _SQL_MAX_PARAMS):
+            batch = rowids[i:i + _SQL_MAX_PARAMS]
+            for rowid, device in chain.from_iterable(db.execute_safe_query_iter(
+                    "SELECT rowid, device FROM devices WHERE rowid IN ({})".format(",".join("?" * len(batch))),
+                    tuple(batch), tuples=True)):
+                raw = pending[rowid]
+                try:
+                    blob = _json_loads(device) if device else {}
+                    ssids = self._extract_ssids(blob)
+                    mfr = blob.get("kismet.device.base.manuf", "") or lookup_manufacturer(raw["mac"])
+                except Exception:
+                    continue
+                raw["manufacturer"], raw["ssids"] = mfr, ssids
+                cache[raw["mac"]] = (raw["last_time"], mfr, tuple(ssids))
+        # Rows whose blob failed to parse (or vanished) are dropped, as before
+        devices[start:] = [raw for raw in devices[start:] if raw["ssids"] is not None]
+
     def _extract_ssids(self, blob: dict) -> list[str]:
-        ssids = []
+        d11 = blob.get("dot11.device")
+        if not isinstance(d11, dict):
+            return []
+        ssids: dict[str, None] = {}  # insertion-ordered set
         try:
-            for key in ["dot11.device.probed_ssid_map", "dot11.device.advertised_ssid_map"]:
-                mp = blob.get("dot11.device", {}).get(key, {})
+            for key in _SSID_MAP_KEYS:
+                mp = d11.get(key)
                 if isinstance(mp, dict):
                     for v in mp.values():
                         s = v.get("dot11.probedssid.ssid") or v.get("dot11.advertisedssid.ssid", "")
-                        if s and s not in ssids:
-                            ssids.append(s)
+                        if s:
+                            ssids[s] = None
         except Exception:
             pass
-        return ssids
+        return list(ssids)
 
-    def _update_profile(self, raw: dict, mode: str) -> DeviceProfile:
+    def _update_profile(self, raw: dict, mode: str, now_dt: Optional[datetime] = None) -> DeviceProfile:
+        """Fold one parsed row into its profile. Sweeps pass one now_dt for all their rows."""
         mac = raw["mac"]
-        manufacturer = raw.get("manufacturer") or lookup_manufacturer(mac)
-        now_dt = datetime.now()
-        last_dt = datetime.fromtimestamp(raw["last_time"]) if raw.get("last_time") else now_dt
-        first_dt = datetime.fromtimestamp(raw["first_time"]) if raw.get("first_time") else now_dt
+        manufacturer = _intern(raw.get("manufacturer") or lookup_manufacturer(mac))
+        if now_dt is None:
+            now_dt = datetime.now()
+        last_time = raw.get("last_time")
+        last_seen = _ts_iso(last_time) if last_time else now_dt.isoformat()
+        ssids = raw.get("ssids", [])
 
-        if mac not in self.devices:
-            self.devices[mac] = DeviceProfile(
+        p = self.devices.get(mac)
+        if p is None:
+            first_time = raw.get("first_time")
+            p = self.devices[mac] = DeviceProfile(
                 mac=mac,
                 manufacturer=manufacturer,
-                ssids=raw.get("ssids", []),
-                first_seen=first_dt.isoformat(),
-                last_seen=last_dt.isoformat(),
+                ssids=ssids,
+                first_seen=_ts_iso(first_time) if first_time else now_dt.isoformat(),
+                last_seen=last_seen,
                 total_encounters=0,
             )
-        p = self.devices[mac]
+            self.unknown_count += 1  # new profiles start unlabeled, with no modes
+        self._dirty.add(mac)
         p.total_encounters += 1
-        p.last_seen = last_dt.isoformat()
+        p.last_seen = last_seen
         if not p.manufacturer or p.manufacturer == "Unknown":
             p.manufacturer = manufacturer
-        for s in raw.get("ssids", []):
-            if s and s not in p.ssids:
-                p.ssids.append(s)
-        if raw.get("signal") is not None:
-            p.signal_history.append(raw["signal"])
-            if len(p.signal_history) > 20:
-                p.signal_history = p.signal_history[-20:]
-        if mode and mode not in p.modes_seen_in:
-            p.modes_seen_in.append(mode)
+        if ssids:
+            known = p.ssids
+            for s in ssids:
+                if s and s not in known:
+                    known.append(s)
+        signal = raw.get("signal")
+        if signal is not None:
+            p.signal_history.append(signal)  # bounded deque drops the oldest
+        modes = p.modes_seen_in
+        if mode and mode not in modes:
+            was_unknown = _is_unknown(p)
+            modes.append(mode)
+            p._mode_bits |= _MODE_BITS.get(mode, 0)
+            self.unknown_count += _is_unknown(p) - was_unknown
         return p
 
     # ─── Scoring ──────────────────────────────
-    def _recency_score(self, last_seen_iso: str) -> float:
-        try:
-            days = max(0, (datetime.now() - datetime.fromisoformat(last_seen_iso)).total_seconds() / 86400)
-            return 1.0 / (1 + days)
-        except Exception:
+    def _recency_score(self, last_seen_iso: str, now_ts: Optional[float] = None) -> float:
+        """now_ts is naive-epoch seconds (see _EPOCH); defaults to now."""
+        last_ts = _iso_ts(last_seen_iso)
+        if last_ts is None:
             return 0.1
-
-    def _compute_score(self, p: DeviceProfile) -> float:
-        return p.total_encounters * self._recency_score(p.last_seen)
+        if now_ts is None:
+            now_ts = (datetime.now() - _EPOCH).total_seconds()
+        days = max(0, (now_ts - last_ts) / 86400)
+        return 1.0 / (1 + days)
+
+    def _compute_score(self, p: DeviceProfile, now_ts: Optional[float] = None) -> float:
+        return p.total_encounters * self._recency_score(p.last_seen, now_ts)
+
+    def _score_profiles(self, profiles: list, now_ts: float):
+        """Set encounter_score on every profile touched by a sweep, in one numpy pass when available."""
+        if not (HAS_NUMPY and profiles):
+            for p in profiles:
+                p.encounter_score = self._compute_score(p, now_ts)
+            return
+        n = len(profiles)
+        enc = np.fromiter((p.total_encounters for p in profiles), dtype=float, count=n)
+        last_ts = np.fromiter((_iso_ts(p.last_seen) for p in profiles), dtype=float, count=n)
+        days = np.maximum(0, (now_ts - last_ts) / 86400)
+        recency = np.where(np.isnan(last_ts), 0.1, 1.0 / (1 + days))
+        for p, score in zip(profiles, (enc * recency).tolist()):
+            p.encounter_score = score
 
     # ─── Signal trend ─────────────────────────
     def calculate_signal_trend(self, mac: str) -> str:
         if mac not in self.devices:
             return "unknown"
-        hist = self.devices[mac].signal_history[-5:]
+        hist = self.devices[mac].signal_history
         if len(hist) < 2:
             return "unknown"
-        delta = hist[-1] - hist[0]
+        # Change across the last (up to) 5 samples
+        delta = hist[-1] - hist[-min(5, len(hist))]
         if delta > 5:
             return "approaching"
         elif delta < -5:
             return "receding"
         return "stable"
 
+    def _trend_profiles(self, profiles: list):
+        """calculate_signal_trend for every profile touched by a sweep, classified in one numpy pass when available."""
+        if not (HAS_NUMPY and profiles):
+            for p in profiles:
+                p.signal_trend = self.calculate_signal_trend(p.mac)
+            return
+        n = len(profiles)
+        # (newest - oldest of the last 5) per profile; NaN where there are < 2 samples
+        delta = np.fromiter(
+            (h[-1] - h[-min(5, len(h))] if len(h) >= 2 else math.nan
+             for h in (p.signal_history for p in profiles)),
+            dtype=float, count=n)
+        trends = np.select([np.isnan(delta), delta > 5, delta < -5],
+                           ["unknown", "approaching", "receding"], "stable")
+        for p, trend in zip(profiles, trends.tolist()):
+            p.signal_trend = _TRENDS[trend]
+
     # ─── Linger check ─────────────────────────
     def _check_linger(self, mac: str, ssids: list, signal: Optional[int]):
         """Track how long an unknown device has been nearby. Fire alert if > threshold."""
-        linger_min = self.timing.get("unknown_ssid_linger_minutes", 5)
-        now = datetime.now()
+        linger_s = self._linger_minutes * 60
+        now = time.monotonic()
+        alerted = self._linger_alerted
 
         if mac not in self.devices or not self.devices[mac].label:
             if mac not in self._linger_first_seen:
                 self._linger_first_seen[mac] = now
             else:
-                elapsed = (now - self._linger_first_seen[mac]).total_seconds() / 60
-                if elapsed >= linger_min and mac not in self._linger_alerted:
-                    self._linger_alerted.add(mac)
+                elapsed_s = now - self._linger_first_seen[mac]
+                if mac in alerted:
+                    alerted.move_to_end(mac)
+                elif elapsed_s >= linger_s:
+                    elapsed = elapsed_s / 60
+                    alerted[mac] = None
+                    if len(alerted) > LINGER_ALERTED_MAX:
+                        alerted.popitem(last=False)
                     ssid_str = ssids[0] if ssids else "(hidden)"
                     self.fire_alert(
                         "WARNING",
@@ -343,37 +917,93 @@ class TailDetector:
                             ssid_str, mac, elapsed, signal, self.config)
         else:
             self._linger_first_seen.pop(mac, None)
-            self._linger_alerted.discard(mac)
+            alerted.pop(mac, None)
+
+        if now - self._linger_pruned_at >= linger_s:
+            self._prune_linger(now)
+
+    def _prune_linger(self, now: float):
+        """Forget first-seen times older than 4x the linger threshold, so the map stays bounded."""
+        self._linger_pruned_at = now
+        horizon = self._linger_minutes * 4 * 60
+        stale = [m for m, t in self._linger_first_seen.items() if now - t > horizon]
+        for m in stale:
+            del self._linger_first_seen[m]
 
     # ─── Alerts ───────────────────────────────
     def fire_alert(self, level: str, message: str):
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         _push_alert(level, message)
 
-        if self.alert_cfg.get("log_alerts", True):
-            try:
-                with open(self.alerts_log, "a") as f:
-                    f.write(f"[{ts}] [{level}] {message}\n")
-            except Exception:
-                pass
-
-        if self.alert_cfg.get("console_alerts", True):
+        # Repeats of the same alert within ALERT_REPEAT_WINDOW seconds only reach the SSE queue
+        mono = time.monotonic()
+        key = (level, message)
+        with self._alert_io_lock:
+            last = self._recent_alerts.get(key)
+            if last is not None and mono - last < ALERT_REPEAT_WINDOW:
+                return
+            self._recent_alerts[key] = mono
+            if len(self._recent_alerts) > 1024:
+                self._recent_alerts = {k: t for k, t in self._recent_alerts.items()
+                                       if mono - t < ALERT_REPEAT_WINDOW}
+
+            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            if self._log_alerts:
+                if self._alert_writer is None or not self._alert_writer.is_alive():
+                    self._alert_writer = threading.Thread(target=self._alert_log_worker, daemon=True,
+                                                          name="alert-log")
+                    self._alert_writer.start()
+                self._alert_lines.put(f"[{ts}] [{level}] {message}\n")
+
+        if self._console_alerts:
             if level == "CRITICAL":
                 w = max(len(message) + 4, 36)
-                b = "─" * w
-                print(f"\n{_RED}{_BOLD}┌{b}┐")
-                print(f"│  ⚠  CRITICAL ALERT{' '*(w-19)}│")
+                top, title, bottom = _critical_box(w)
+                print(top)
+                print(title)
                 print(f"│  {message[:w-4]:<{w-4}}│")
-                print(f"└{b}┘{_RESET}\n")
+                print(bottom)
             elif level == "WARNING":
                 print(f"{_ORANGE}[{ts}] ⚡ WARNING: {message}{_RESET}")
             else:
                 print(f"{_CYAN}[{ts}] ℹ  INFO: {message}{_RESET}")
 
+    def _alert_log_worker(self):
+        """Append queued alert lines to alerts_log, one write + flush per drained batch."""
+        q = self._alert_lines
+        while True:
+            lines = [q.get()]
+            while len(lines) < 256:
+                try:
+                    lines.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self._alert_fh is None:
+                    self._alert_fh = open(self.alerts_log, "a")
+                self._alert_fh.write("".join(lines))
+                self._alert_fh.flush()
+            except Exception:
+                self._close_alert_log()
+            finally:
+                for _ in lines:
+                    q.task_done()
+
+    def flush_alert_log(self):
+        """Block until every queued alert line has been written (or has failed)."""
+        self._alert_lines.join()
+
+    def _close_alert_log(self):
+        if self._alert_fh is not None:
+            try:
+                self._alert_fh.close()
+            except Exception:
+                pass
+            self._alert_fh = None
+
     # ─── Cross-mode detection ─────────────────
     def _check_cross_mode(self, p: DeviceProfile, current_mode: str):
-        other = "ROAM" if current_mode == "HOME" else "HOME"
-        if other in p.modes_seen_in and not p.cross_mode_detected:
+        other = MODE_ROAMING if current_mode == "STATIONARY" else MODE_STATIONARY
+        if p._mode_bits & other and not p.cross_mode_detected:
             p.cross_mode_detected = True
             msg = f"⚠ CROSS-MODE: {p.display_name()} seen in ROAMING & STATIONARY"
             self.fire_alert("CRITICAL", msg)
@@ -393,28 +1023,35 @@ class TailDetector:
         alert_msg = "STATIONARY mode started" + (" (with Doorbell Alerts)" if doorbell_alerts else "")
         self.fire_alert("INFO", alert_msg)
         
-        interval = self.timing.get("doorbell_scan_interval", 10)
+        interval = self._doorbell_interval
         unknown_streak: dict[str, int] = {}
         prev_present: set = set()
+        stop = self.stop_event
 
-        while not _push_alert.__globals__.get('_bg_stop_event').is_set():
+        while not stop.is_set():
             files = self._get_kismet_files(hours=1)
             current_macs: set = set()
+            started = time.monotonic()
+            now_dt = datetime.now()
+            now_ts = (now_dt - _EPOCH).total_seconds()
+            present_cutoff = time.time() - interval * 3
+            swept: dict[str, DeviceProfile] = {}
             
-            for db_path in files:
-                for raw in self._parse_kismet_db(db_path):
+            # Only devices inside the presence window; older rows never leave SQLite
+            for rows in self._parse_kismet_dbs(files, since=present_cutoff):
+                for raw in rows:
+                    current_macs.add(raw["mac"])
+                    # A Kismet write can wake the sweep early (see _wait_for_kismet);
+                    # devices are still counted at most once per interval
+                    if self._unchanged("STATIONARY", raw, started, interval):
+                        # Nothing new observed, but it is still present
+                        continue
+
                     # Basic update
-                    p = self._update_profile(raw, "STATIONARY")
+                    p = self._update_profile(raw, "STATIONARY", now_dt)
                     p.home_encounters += 1
-                    p.encounter_score = self._compute_score(p)
-                    p.signal_trend = self.calculate_signal_trend(p.mac)
+                    swept[p.mac] = p
                     
-                    # Stationary specific logic
-                    if raw.get("last_time"):
-                        age = datetime.now() - datetime.fromtimestamp(raw["last_time"])
-                        if age <= timedelta(seconds=interval * 3):
-                            current_macs.add(p.mac)
-
                     # Doorbell functionality (if enabled)
                     if doorbell_alerts and p.mac not in prev_present:
                         self._handle_arrival(p, raw, unknown_streak)
@@ -425,6 +1062,13 @@ class TailDetector:
                     
                     self._check_cross_mode(p, "STATIONARY")
 
+            # Nothing in the loop above reads the trend, so it is set once per device here
+            self._trend_profiles(list(swept.values()))
+            self._score_profiles(list(swept.values()), now_ts)
+            # Dashboard dicts are dropped only after the sweep's last write to each profile
+            for p in swept.values():
+                self._drop_api_dict(p)
+
             # Departure logic (if enabled)
             if doorbell_alerts:
                 for mac in prev_present - current_macs:
@@ -433,7 +1077,23 @@ class TailDetector:
             self.present_macs = current_macs
             prev_present = set(current_macs)
             self._save_whitelist()
-            time.sleep(interval)
+            self._wait_for_kismet(interval, stop)
+
+    def _unchanged(self, sweep: str, raw: dict, started: float = 0.0, min_gap: float = 0) -> bool:
+        """
+        True if this kind of sweep already folded in this device at this last_time,
+        or in an earlier sweep started less than `min_gap` seconds before this one
+        (`started`, a time.monotonic()). Records the row otherwise; kept per sweep
+        kind so each mode still sees every device once.
+        """
+        seen = self._sweep_last_time.setdefault(sweep, {})
+        last_time = raw.get("last_time")
+        prev = seen.get(raw["mac"])
+        if prev is not None and (last_time is not None and prev[0] == last_time
+                                 or prev[1] != started and started - prev[1] < min_gap):
+            return True
+        seen[raw["mac"]] = (last_time, started)
+        return False
 
     def _handle_arrival(self, p: DeviceProfile, raw: dict, unknown_streak: dict):
         name = p.display_name()
@@ -458,7 +1118,7 @@ class TailDetector:
         self.fire_alert("INFO", f"LEFT: {name}")
         unknown_streak.pop(mac, None)
         self._linger_first_seen.pop(mac, None)
-        self._linger_alerted.discard(mac)
+        self._linger_alerted.pop(mac, None)
 
     # ═══════════════════════════════════════════
     #  MODE 2: ROAMING
@@ -466,7 +1126,7 @@ class TailDetector:
     def run_roaming_mode(self, hours: int = 24, continuous: bool = True):
         self.current_mode = "ROAMING"
         self.fire_alert("INFO", f"ROAMING mode started — scanning last {hours}h")
-        interval = self.timing.get("roam_scan_interval", 15)
+        interval = self._roam_interval
 
         def _scan():
             files = self._get_kismet_files(hours=hours)
@@ -474,14 +1134,25 @@ class TailDetector:
                 self.fire_alert("WARNING", "No recent .kismet files found.")
                 return
             poi_macs = set()
-            for db_path in files:
-                for raw in self._parse_kismet_db(db_path):
+            started = time.monotonic()
+            now_dt = datetime.now()
+            now_ts = (now_dt - _EPOCH).total_seconds()
+            swept: dict[str, DeviceProfile] = {}
+            since = time.time() - hours * 3600 if hours is not None else None
+            for rows in self._parse_kismet_dbs(files, since=since):
+                for raw in rows:
                     mac = raw["mac"]
-                    p = self._update_profile(raw, "ROAMING")
-                    p.encounter_score = self._compute_score(p)
+                    if self._unchanged("ROAMING", raw, started, interval if continuous else 0):
+                        # Nothing new observed; keep it in the POI table without re-counting
+                        p = self.devices.get(mac)
+                        if p is not None and not p._mode_bits & MODE_STATIONARY and p.roam_encounters > 0:
+                            poi_macs.add(mac)
+                        continue
+                    p = self._update_profile(raw, "ROAMING", now_dt)
+                    swept[mac] = p
                     p.signal_trend = self.calculate_signal_trend(mac)
 
-                    if "STATIONARY" not in p.modes_seen_in:
+                    if not p._mode_bits & MODE_STATIONARY:
                         p.roam_encounters += 1
                         poi_macs.add(mac)
 
@@ -491,21 +1162,24 @@ class TailDetector:
                         if self._notif:
                             self._notif.notify_watchlist_hit(p.label, mac, raw.get("signal"), p.notes, self.config)
 
-                    thresh = self.thresholds.get("signal_approaching_threshold", -65)
-                    if p.signal_trend == "approaching" and (raw.get("signal") or -100) > thresh:
+                    if p.signal_trend == "approaching" and (raw.get("signal") or -100) > self._approach_thresh:
                         self.fire_alert("WARNING", f"Device approaching: {p.display_name()} ({mac}) {raw.get('signal')} dBm ↑")
 
-                    if "STATIONARY" in p.modes_seen_in:
+                    if p._mode_bits & MODE_STATIONARY:
                         self._check_cross_mode(p, "ROAMING")
 
-            pois = sorted([self.devices[m] for m in poi_macs if m in self.devices], key=lambda x: x.encounter_score, reverse=True)
-            self._print_roam_table(pois[:20])
+            self._score_profiles(list(swept.values()), now_ts)
+            for p in swept.values():
+                self._drop_api_dict(p)
+            pois = self._top_by_score((self.devices[m] for m in poi_macs if m in self.devices), 20)
+            self._print_roam_table(pois)
             self._save_whitelist()
 
         if continuous:
-            while not _push_alert.__globals__.get('_bg_stop_event').is_set():
+            stop = self.stop_event
+            while not stop.is_set():
                 _scan()
-                time.sleep(interval)
+                self._wait_for_kismet(interval, stop)
         else:
             _scan()
 
@@ -537,77 +1211,130 @@ class TailDetector:
             return
         self.fire_alert("INFO", f"WATCHLIST mode — monitoring {len(watchlist)} devices")
         w_macs = {p.mac for p in watchlist}
-
-        while not _push_alert.__globals__.get('_bg_stop_event').is_set():
-            for db_path in self._get_kismet_files(hours=1):
-                for raw in self._parse_kismet_db(db_path):
-                    if raw["mac"] in w_macs:
+        stop = self.stop_event
+
+        while not stop.is_set():
+            started = time.monotonic()
+            # The alert only needs mac, signal and last_time, so blobs are never read
+            for rows in self._parse_kismet_dbs(self._get_kismet_files(hours=1), macs=w_macs, blobs=False):
+                for raw in rows:
+                    if raw["mac"] in w_macs and not self._unchanged("WATCHLIST", raw, started, 30):
                         p = self.devices[raw["mac"]]
                         msg = f"WATCHLISTED: {p.display_name()} ({p.mac}) Signal:{raw.get('signal','?')} dBm"
                         self.fire_alert("CRITICAL", msg)
                         if self._notif:
                             self._notif.notify_watchlist_hit(p.label, p.mac, raw.get("signal"), p.notes, self.config)
-            time.sleep(30)
+            self._wait_for_kismet(30, stop)
 
 
     # ═══════════════════════════════════════════
     #  Utility
     # ═══════════════════════════════════════════
     def label_device(self, mac: str, label: str, group: str = "unknown", notes: str = ""):
-        if mac not in self.devices:
-            self.devices[mac] = DeviceProfile(mac=mac)
-        p = self.devices[mac]
+        p = self.devices.get(mac)
+        was_unknown = p is not None and _is_unknown(p)
+        if p is None:
+            p = self.devices[mac] = DeviceProfile(mac=mac)
+        self._dirty.add(mac)
         p.label = label; p.group = group
         if notes: p.notes = notes
+        self._drop_api_dict(p)
+        self.unknown_count += _is_unknown(p) - was_unknown
+        self._index_watchlist(mac)
         self._save_whitelist()
         self.fire_alert("INFO", f"Labeled: {mac} → '{label}' ({group})")
 
     def add_to_watchlist(self, mac: str, reason: str = ""):
         if mac not in self.devices:
             self.devices[mac] = DeviceProfile(mac=mac)
+            self.unknown_count += 1
         p = self.devices[mac]
+        self._dirty.add(mac)
         p.is_watchlisted = True; p.group = "watchlist"
+        self._index_watchlist(mac)
         if reason: p.notes = f"WATCHLISTED: {reason}"
+        self._drop_api_dict(p)
         self._save_whitelist()
         self.fire_alert("WARNING", f"Added to watchlist: {mac} — {reason}")
 
     def remove_from_watchlist(self, mac: str):
         if mac in self.devices:
+            self._dirty.add(mac)
             self.devices[mac].is_watchlisted = False
             if self.devices[mac].group == "watchlist":
                 self.devices[mac].group = "unknown"
+            self._drop_api_dict(self.devices[mac])
+            self._index_watchlist(mac)
             self._save_whitelist()
             self.fire_alert("INFO", f"Removed from watchlist: {mac}")
 
+    @staticmethod
+    def _top_by_score(profiles, limit: int) -> list:
+        """sorted(profiles, by score, descending)[:limit] without sorting past the top `limit`."""
+        if limit < 0:
+            return sorted(profiles, key=_score_key, reverse=True)[:limit]
+        # heapq.nlargest keeps the same tie order as the stable descending sort
+        return heapq.nlargest(limit, profiles, key=_score_key)
+
+    def top_devices(self, limit: int) -> list:
+        """The `limit` highest-scored devices of all, best first."""
+        return self._top_by_score(self.snapshot_devices(), limit)
+
     def get_top_visitors(self, limit: int = 10):
-        stat = [p for p in self.devices.values()
-                if "STATIONARY" in p.modes_seen_in or p.home_encounters > 0]
-        return sorted(stat, key=lambda p: p.encounter_score, reverse=True)[:limit]
+        stat = (p for p in self.snapshot_devices()
+                if p._mode_bits & MODE_STATIONARY or p.home_encounters > 0)
+        return self._top_by_score(stat, limit)
 
     def get_persons_of_interest(self, limit: int = 10):
-        pois = [p for p in self.devices.values()
-                if "STATIONARY" not in p.modes_seen_in and p.roam_encounters > 0]
-        return sorted(pois, key=lambda p: p.encounter_score, reverse=True)[:limit]
+        pois = (p for p in self.snapshot_devices()
+                if not p._mode_bits & MODE_STATIONARY and p.roam_encounters > 0)
+        return self._top_by_score(pois, limit)
+
+    def _index_watchlist(self, mac: str):
+        """Re-file `mac` in _watchlist_macs after its watchlist flag or group changed."""
+        p = self.devices[mac]
+        if p.is_watchlisted or p.group == "watchlist":
+            self._watchlist_macs[mac] = None
+        else:
+            self._watchlist_macs.pop(mac, None)
+        self.watchlist_version += 1
+
+    def _drop_api_dict(self, p: DeviceProfile):
+        """Invalidate p's cached to_api_dict() after a write, bumping watchlist_version if it is watchlisted."""
+        p._api_gen = next(_api_generations)
+        if p.mac in self._watchlist_macs:
+            self.watchlist_version += 1
 
     def get_watchlist(self):
-        return [p for p in self.devices.values()
-                if p.is_watchlisted or p.group == "watchlist"]
+        return [self.devices[mac] for mac in tuple(self._watchlist_macs)]
+
+    def snapshot_devices(self) -> tuple:
+        """
+        All profiles as of now, safe to iterate while a sweep thread adds devices.
+        tuple() copies the dict's values in a single C call, which the GIL keeps
+        atomic, so readers need no lock (and sweeps never wait on one).
+        """
+        return tuple(self.devices.values())
+
+    def csv_rows(self, profiles=None) -> Iterator[list]:
+        """export_to_csv's rows, header first, generated lazily over `profiles` (default: all devices)."""
+        fieldnames = _PROFILE_FIELDS
+        get_row = operator.attrgetter(*fieldnames)
+        joined = [i for i, k in enumerate(fieldnames) if k in ("ssids", "signal_history", "modes_seen_in")]
+        yield list(fieldnames)
+        for p in (self.snapshot_devices() if profiles is None else profiles):
+            row = list(get_row(p))
+            for i in joined:
+                row[i] = "|".join(map(str, row[i]))
+            yield row
 
     def export_to_csv(self, filename: str):
-        fieldnames = list(DeviceProfile.__dataclass_fields__.keys())
         with open(filename, "w", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=fieldnames)
-            w.writeheader()
-            for p in self.devices.values():
-                d = p.to_dict()
-                for key in ("ssids", "signal_history", "modes_seen_in"):
-                    d[key] = "|".join(map(str, d.get(key, [])))
-                w.writerow(d)
+            csv.writer(f).writerows(self.csv_rows())
         self.fire_alert("INFO", f"Exported {len(self.devices)} devices → {filename}")
 
     def export_to_json(self, filename: str):
-        with open(filename, "w") as f:
-            json.dump({mac: p.to_dict() for mac, p in self.devices.items()}, f, indent=2)
+        _write_profiles(filename, self.devices)
         self.fire_alert("INFO", f"Exported {len(self.devices)} devices → {filename}")
 
     def get_all_devices_list(self) -> list[dict]:
@@ -620,7 +1347,10 @@ class TailDetector:
         return result
 
     def _get_mac_idle_time(self) -> float:
-        """Use ioreg to get macOS system idle time in seconds."""
+        """macOS system idle time in seconds: IOKit via ctypes, else ioreg."""
+        idle = _iokit_idle_time()
+        if idle is not None:
+            return idle
         try:
             cmd = "ioreg -c IOHIDSystem | awk '/HIDIdleTime/ {print $NF/1000000000; exit}'"
             out = subprocess.check_output(cmd, shell=True).decode().strip()
@@ -637,8 +1367,9 @@ class TailDetector:
         self.fire_alert("INFO", f"SCREENSAVER mode active (threshold: {idle_threshold}s)")
         
         is_scanning = False
+        stop = self.stop_event
         
-        while not _push_alert.__globals__.get('_bg_stop_event').is_set():
+        while not stop.is_set():
             idle = self._get_mac_idle_time()
             
             if idle >= idle_threshold:
@@ -648,9 +1379,11 @@ class TailDetector:
                 
                 # Perform a single scan iteration (Stationary logic)
                 files = self._get_kismet_files(hours=1)
-                for db_path in files:
-                    for raw in self._parse_kismet_db(db_path):
-                        self._update_profile(raw, "STATIONARY")
+                now_dt = datetime.now()
+                for rows in self._parse_kismet_dbs(files):
+                    for raw in rows:
+                        if not self._unchanged("SCREENSAVER", raw):
+                            self._drop_api_dict(self._update_profile(raw, "STATIONARY", now_dt))
                 
                 self.fire_alert("INFO", f"Screensaver scan complete. System still idle ({int(idle)}s)")
             else:
@@ -658,12 +1391,11 @@ class TailDetector:
                     self.fire_alert("INFO", "User returned: Sentinel scan paused")
                     is_scanning = False
             
-            time.sleep(10)
+            stop.wait(10)
 
 
 # ── CLI ───────────────────────────────────────
 if __name__ == "__main__":
-    import sys
     mode = (sys.argv[1] if len(sys.argv) > 1 else "home").upper()
     td = TailDetector()
     if mode == "HOME":      td.run_home_mode()
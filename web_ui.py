@@ -3,24 +3,56 @@ web_ui.py — SentinelWatch Flask Dashboard
 Serves the Apple Glass web dashboard at http://localhost:8888
 """
 
+import csv
+import functools
+import io
 import json
 import os
 import queue
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import os
 import stat
 import json
 import platform
-import psutil
-from fpdf import FPDF
+import sys
 from datetime import datetime
-from flask import Flask, jsonify, render_template, request, Response, stream_with_context
-from flask_cors import CORS
-
-from tail_detector import TailDetector, get_recent_alerts
+from itertools import islice
+
+try:
+    import psutil
+    from fpdf import FPDF
+    from flask import Flask, jsonify, render_template, request, Response, stream_with_context
+    from flask_cors import CORS
+except ImportError as e:
+    if __name__ != "__main__":
+        raise
+    # The desktop launcher installs requirements and relaunches on exit code 3
+    print(f"⚠  Missing dependency: {e.name} — run: pip install -r requirements.txt")
+    sys.exit(3)
+
+# Try orjson for faster API/SSE serialization, fall back to jsonify / json.dumps
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Kismet status checks need requests; without it Kismet is reported disconnected
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+from tail_detector import TailDetector, get_recent_alerts, get_recent_alerts_json, wait_for_alerts
 
 # ──────────────────────────────────────────────
+# uname() results never change while the process runs
+_PLATFORM_SYSTEM = platform.system()
+_PLATFORM_NODE = platform.node()
+
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.json")
 app = Flask(__name__)
 CORS(app)
@@ -28,37 +60,90 @@ CORS(app)
 # Global detector instance
 detector = TailDetector(config_path=CONFIG_PATH)
 
-# SSE subscriber queues
-_sse_clients: list[queue.Queue] = []
+# SSE subscriber queues; publishers iterate a snapshot taken under the lock
+_sse_clients: set[queue.SimpleQueue] = set()
+# Frames a subscriber may fall behind by before it is dropped as dead
+SSE_QUEUE_MAX = 50
+# Seconds without an alert before the pusher sends every subscriber a heartbeat
+SSE_HEARTBEAT = 25
+# Most alerts coalesced into one SSE frame (the newest are kept)
+SSE_BATCH_MAX = 64
 _sse_lock = threading.Lock()
 
 # Background mode thread handle
 _bg_thread: threading.Thread | None = None
-_bg_stop_event = threading.Event()
+
+
+# ──────────────────────────────────────────────
+#  Config + JSON helpers
+# ──────────────────────────────────────────────
+@functools.lru_cache(maxsize=1)
+def _load_config_cached(mtime_ns: int) -> dict:
+    with open(CONFIG_PATH, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def _load_config() -> dict:
+    """Parsed config.json, re-read only when the file's mtime changes. Treat as read-only."""
+    return _load_config_cached(os.stat(CONFIG_PATH).st_mtime_ns)
+
+
+def _json_response(obj) -> Response:
+    """jsonify(obj), serialized by orjson when available."""
+    if HAS_ORJSON:
+        return Response(_json_bytes(obj), mimetype="application/json")
+    return jsonify(obj)
+
+
+def _json_bytes(obj) -> bytes:
+    """obj as a JSON response body, via orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj).encode()
+
+
+def _json_dumps(obj) -> str:
+    """json.dumps(obj) for SSE frames, via orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
 
 
 # ──────────────────────────────────────────────
 #  SSE alert pusher
 # ──────────────────────────────────────────────
+def _broadcast(payload: str | None):
+    """Queue one SSE frame (None = heartbeat) for every subscriber, dropping any too far behind."""
+    with _sse_lock:
+        subs = tuple(_sse_clients)
+    dead = []
+    for q in subs:
+        if q.qsize() >= SSE_QUEUE_MAX:
+            dead.append(q)
+        else:
+            q.put(payload)
+    if dead:
+        with _sse_lock:
+            _sse_clients.difference_update(dead)
+
+
 def _alert_pusher():
-    """Watch alert queue and push new items to all SSE subscribers."""
-    last_count = 0
-    while not _bg_stop_event.is_set():
-        alerts = get_recent_alerts(limit=200)
-        if len(alerts) > last_count:
-            new_alerts = alerts[last_count:]
-            last_count = len(alerts)
-            payload = json.dumps(new_alerts[-1])  # push latest
-            with _sse_lock:
-                dead = []
-                for q in _sse_clients:
-                    try:
-                        q.put_nowait(payload)
-                    except queue.Full:
-                        dead.append(q)
-                for q in dead:
-                    _sse_clients.remove(q)
-        time.sleep(0.5)
+    """Wait for new alerts and push them to all SSE subscribers, plus a shared heartbeat."""
+    seen = 0
+    last_frame = time.monotonic()
+    # Runs for the life of the process. It must not watch the detector's stop_event:
+    # that is set on every mode switch, which used to end the SSE feed for good.
+    while True:
+        # Wakes on the next alert; the timeout bounds how late a heartbeat is
+        seen, new_alerts = wait_for_alerts(seen, timeout=5)
+        if new_alerts:
+            # One frame per wakeup: a burst goes out as a single JSON array
+            _broadcast(_json_dumps(new_alerts[-SSE_BATCH_MAX:]))
+            last_frame = time.monotonic()
+        elif time.monotonic() - last_frame >= SSE_HEARTBEAT:
+            _broadcast(None)
+            last_frame = time.monotonic()
 
 
 threading.Thread(target=_alert_pusher, daemon=True).start()
@@ -68,11 +153,12 @@ threading.Thread(target=_alert_pusher, daemon=True).start()
 #  Background mode runner
 # ──────────────────────────────────────────────
 def _run_mode_background(mode: str):
-    global _bg_thread, _bg_stop_event
-    _bg_stop_event.set()
+    global _bg_thread
+    detector.stop_mode()
     if _bg_thread and _bg_thread.is_alive():
+        # A sweep already under way still has to finish before the loop sees the stop
         _bg_thread.join(timeout=3)
-    _bg_stop_event = threading.Event()
+    detector.stop_event = threading.Event()
 
     def _target():
         if mode == "STATIONARY":
@@ -93,15 +179,38 @@ def _run_mode_background(mode: str):
 # ──────────────────────────────────────────────
 #  Kismet connection check
 # ──────────────────────────────────────────────
+# Seconds a Kismet status result is reused; dashboards poll /api/status every few seconds
+KISMET_STATUS_TTL = 3
+# (time.monotonic() fetched, status dict) of the last upstream check
+_kismet_cache: tuple = (0.0, None)
+_kismet_cache_lock = threading.Lock()
+# Keep-alive connection to the Kismet API; only used under _kismet_cache_lock
+_kismet_session = requests.Session() if HAS_REQUESTS else None
+
+
 def _kismet_status() -> dict:
+    """_query_kismet_status(), shared by all pollers for KISMET_STATUS_TTL seconds."""
+    global _kismet_cache
+    fetched, status = _kismet_cache
+    if status is not None and time.monotonic() - fetched < KISMET_STATUS_TTL:
+        return status
+    with _kismet_cache_lock:
+        # Another poller may have refreshed it while this one waited
+        fetched, status = _kismet_cache
+        if status is None or time.monotonic() - fetched >= KISMET_STATUS_TTL:
+            status = _query_kismet_status()
+            _kismet_cache = (time.monotonic(), status)
+        return status
+
+
+def _query_kismet_status() -> dict:
+    if not HAS_REQUESTS:
+        return {"connected": False}
     try:
-        import requests
-        with open(CONFIG_PATH) as f:
-            cfg = json.load(f)
-        api = cfg.get("kismet_api", {})
-        r = requests.get(f"{api.get('base_url','http://localhost:2501')}/system/status.json",
-                        auth=(api.get("username", "kismet"), api.get("password", "")),
-                        timeout=2)
+        api = _load_config().get("kismet_api", {})
+        r = _kismet_session.get(f"{api.get('base_url','http://localhost:2501')}/system/status.json",
+                                auth=(api.get("username", "kismet"), api.get("password", "")),
+                                timeout=2)
         if r.ok:
             return {"connected": True, "data": r.json()}
     except Exception:
@@ -121,12 +230,11 @@ def index():
 @app.route("/api/status")
 def api_status():
     kismet = _kismet_status()
-    return jsonify({
+    return _json_response({
         "mode": detector.current_mode,
         "kismet_connected": kismet["connected"],
         "total_devices": len(detector.devices),
-        "unknown_devices": sum(1 for p in detector.devices.values()
-                               if not p.label and "HOME" not in p.modes_seen_in),
+        "unknown_devices": detector.unknown_count,
         "watchlist_count": len(detector.get_watchlist()),
         "present_count": len(detector.present_macs),
         "timestamp": datetime.now().isoformat(),
@@ -135,20 +243,28 @@ def api_status():
 
 @app.route("/api/whitelist")
 def api_whitelist():
-    return jsonify({
-        "devices": [p.to_dict() | {"display_name": p.display_name(),
-                                    "signal_latest": p.signal_history[-1] if p.signal_history else None}
-                    for p in sorted(detector.devices.values(),
-                                    key=lambda x: x.encounter_score, reverse=True)]
-    })
+    """All devices by score; ?limit=N keeps the top N, ?fields=a,b projects each device."""
+    limit = request.args.get("limit")
+    if limit is None:
+        profiles = sorted(detector.snapshot_devices(), key=lambda x: x.encounter_score, reverse=True)
+    elif limit.isdecimal():
+        profiles = detector.top_devices(int(limit))
+    else:
+        return jsonify({"error": "limit must be a non-negative integer"}), 400
+    fields = request.args.get("fields")
+    if fields:
+        keys = fields.split(",")
+        devices = [{k: d[k] for k in keys if k in d} for d in (p.to_api_dict() for p in profiles)]
+    else:
+        devices = [p.to_api_dict() for p in profiles]
+    return _json_response({"devices": devices})
 
 
 @app.route("/api/top_visitors")
 def api_top_visitors():
     limit = int(request.args.get("limit", 20))
-    return jsonify({
-        "visitors": [p.to_dict() | {"display_name": p.display_name(),
-                                     "signal_latest": p.signal_history[-1] if p.signal_history else None}
+    return _json_response({
+        "visitors": [p.to_api_dict()
                      for p in detector.get_top_visitors(limit)]
     })
 
@@ -156,25 +272,43 @@ def api_top_visitors():
 @app.route("/api/persons")
 def api_persons():
     limit = int(request.args.get("limit", 20))
-    return jsonify({
-        "persons": [p.to_dict() | {"display_name": p.display_name(),
-                                    "signal_latest": p.signal_history[-1] if p.signal_history else None}
+    return _json_response({
+        "persons": [p.to_api_dict()
                     for p in detector.get_persons_of_interest(limit)]
     })
 
 
+# (detector.watchlist_version, body) of the last /api/watchlist response
+_wl_cache: tuple = (-1, b"")
+# Distinguishes this process's watchlist ETags from those of an earlier run
+_WL_ETAG_PREFIX = f"wl-{os.getpid()}-{int(time.time())}"
+
+
 @app.route("/api/watchlist")
 def api_watchlist():
-    return jsonify({
-        "watchlist": [p.to_dict() | {"display_name": p.display_name()}
-                      for p in detector.get_watchlist()]
-    })
+    global _wl_cache
+    # Read before building, so a change made mid-build just causes another rebuild
+    ver = detector.watchlist_version
+    etag = f"{_WL_ETAG_PREFIX}-{ver}"
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        if _wl_cache[0] != ver:
+            _wl_cache = (ver, _json_bytes({
+                "watchlist": [p.to_api_dict()
+                              for p in detector.get_watchlist()]
+            }))
+        resp = Response(_wl_cache[1], mimetype="application/json")
+    resp.set_etag(etag)
+    return resp
 
 
 @app.route("/api/alerts")
 def api_alerts():
     limit = int(request.args.get("limit", 50))
-    return jsonify({"alerts": get_recent_alerts(limit)})
+    # Alerts are serialized once when pushed; only the envelope is built here
+    return Response(b'{"alerts":[' + b",".join(get_recent_alerts_json(limit)) + b"]}",
+                    mimetype="application/json")
 
 
 @app.route("/api/label", methods=["POST"])
@@ -240,9 +374,11 @@ def api_mode():
 @app.route("/api/notifications/config", methods=["GET", "POST"])
 def api_notifications_config():
     """Get or update notification settings (Resend / Twilio)."""
-    with open(CONFIG_PATH) as f:
-        cfg = json.load(f)
     if request.method == "POST":
+        # Fresh copy to edit; the cached one is shared. The write bumps the mtime,
+        # so the next _load_config() re-reads it.
+        with open(CONFIG_PATH) as f:
+            cfg = json.load(f)
         data = request.get_json(force=True)
         alerts = cfg.setdefault("alerts", {})
         if "resend" in data:
@@ -256,14 +392,53 @@ def api_notifications_config():
         with open(CONFIG_PATH, "w") as f:
             json.dump(cfg, f, indent=2)
         # Reload detector config
-        detector.config = cfg
-        detector.alert_cfg = cfg["alerts"]
+        detector.apply_config(cfg)
         return jsonify({"ok": True})
-    return jsonify({"alerts": cfg.get("alerts", {})})
+    return jsonify({"alerts": _load_config().get("alerts", {})})
+
+
+# Rows/records per chunk of a streamed export
+EXPORT_CHUNK = 500
+
+
+def _stream_csv(profiles: tuple):
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    rows = detector.csv_rows(profiles)
+    while True:
+        chunk = list(islice(rows, EXPORT_CHUNK))
+        if not chunk:
+            return
+        w.writerows(chunk)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+
+def _stream_json(items: list):
+    # Same {mac: profile} object as export_to_json, one record encoded at a time
+    yield "{"
+    for i, (mac, p) in enumerate(items):
+        sep = "," if i else ""
+        if HAS_ORJSON:
+            yield f"{sep}{_json_dumps(mac)}:{orjson.dumps(p, default=list).decode()}"
+        else:
+            yield f"{sep}{json.dumps(mac)}:{json.dumps(p.to_dict())}"
+    yield "}"
+
+
+def _download(body, mimetype: str, ext: str) -> Response:
+    name = f"sentinel_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}"
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={"Content-Disposition": f"attachment; filename={name}"})
 
 
 @app.route("/api/export/csv")
 def api_export_csv():
+    """Write the CSV export to data/; ?download=1 streams it to the client instead."""
+    if request.args.get("download") == "1":
+        # Snapshot the profiles: the detector thread may add devices mid-stream
+        return _download(_stream_csv(detector.snapshot_devices()), "text/csv", "csv")
     filename = f"data/sentinel_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     detector.export_to_csv(filename)
     return jsonify({"ok": True, "file": filename})
@@ -271,6 +446,9 @@ def api_export_csv():
 
 @app.route("/api/export/json")
 def api_export_json():
+    """Write the JSON export to data/; ?download=1 streams it to the client instead."""
+    if request.args.get("download") == "1":
+        return _download(_stream_json(list(detector.devices.items())), "application/json", "json")
     filename = f"data/sentinel_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     detector.export_to_json(filename)
     return jsonify({"ok": True, "file": filename})
@@ -295,7 +473,7 @@ def api_export_pdf():
         pdf.set_font("Helvetica", "B", 12)
         pdf.set_text_color(0, 0, 0)
         pdf.cell(0, 10, f"Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", ln=True)
-        pdf.cell(0, 10, f"Host Node: {platform.node()}", ln=True)
+        pdf.cell(0, 10, f"Host Node: {_PLATFORM_NODE}", ln=True)
         pdf.cell(0, 10, f"Total Devices Tracked: {len(detector.devices)}", ln=True)
         pdf.ln(5)
         
@@ -323,28 +501,33 @@ def api_export_pdf():
 # ─── SSE Stream ───────────────────────────────
 @app.route("/api/stream")
 def api_stream():
-    q: queue.Queue = queue.Queue(maxsize=50)
+    # Single producer (the pusher) and consumer (this stream); bounded by the pusher
+    q: queue.SimpleQueue = queue.SimpleQueue()
     with _sse_lock:
-        _sse_clients.append(q)
+        _sse_clients.add(q)
 
     def _generate():
         # Send buffered recent alerts on connect
-        for alert in get_recent_alerts(10):
-            yield f"data: {json.dumps(alert)}\n\n"
+        for alert in get_recent_alerts_json(10):
+            yield b"data: " + alert + b"\n\n"
 
         try:
             while True:
                 try:
-                    data = q.get(timeout=30)
-                    yield f"data: {data}\n\n"
+                    # Heartbeats come from the pusher; the timeout is only a backstop
+                    # so a stream still notices a gone client if the pusher stops
+                    data = q.get(timeout=SSE_HEARTBEAT * 4)
                 except queue.Empty:
+                    data = None
+                if data is None:
                     yield ": heartbeat\n\n"
+                else:
+                    yield f"data: {data}\n\n"
         except GeneratorExit:
             pass
         finally:
             with _sse_lock:
-                if q in _sse_clients:
-                    _sse_clients.remove(q)
+                _sse_clients.discard(q)
 
     return Response(
         stream_with_context(_generate()),
@@ -358,18 +541,66 @@ def api_stream():
 
 
 # ──────────────────────────────────────────────
+# Seconds a stalker ranking is served before a poll triggers a background rescan
+STALKER_REFRESH_INTERVAL = 30
+# Most ranked stalkers kept; requests slice their limit from these
+STALKER_CACHE_LIMIT = 1000
+# (time.monotonic() scanned, ranked stalker dicts) of the last finished scan
+_stalker_cache: tuple = (0.0, None)
+_stalker_lock = threading.RLock()
+# One scan (or checkpoint write) at a time; requests arriving mid-scan share its Future
+_stalker_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stalker-scan")
+_stalker_job: Future | None = None
+
+
+def _scan_stalkers() -> list[dict]:
+    global _stalker_cache
+    from multi_location_tracker import MultiLocationTracker
+    # Scan in-process: spawned workers would re-import this module
+    # (and its detector + background threads) as __mp_main__
+    mlt = MultiLocationTracker(config_path=CONFIG_PATH, max_workers=1)
+    mlt.scan_and_correlate(
+        whitelist_path=detector.config["paths"]["whitelist"]
+    )
+    ranked = [r.to_dict() for r in mlt.get_ranked_stalkers(limit=STALKER_CACHE_LIMIT)]
+    _stalker_cache = (time.monotonic(), ranked)
+    return ranked
+
+
+def _add_checkpoint(lat: float, lon: float, label: str):
+    """
+    Runs on _stalker_pool, so it never interleaves with a scan that would save the
+    data file with the old checkpoint list. Marks the ranking stale for the next poll.
+    """
+    global _stalker_cache
+    from multi_location_tracker import MultiLocationTracker
+    mlt = MultiLocationTracker(config_path=CONFIG_PATH, max_workers=1)
+    cp = mlt.add_checkpoint(lat, lon, label)
+    _stalker_cache = (0.0, _stalker_cache[1])
+    return cp
+
+
+def _refresh_stalkers() -> Future:
+    """Start a stalker scan unless one is already running; returns that scan's Future."""
+    global _stalker_job
+    with _stalker_lock:
+        if _stalker_job is None or _stalker_job.done():
+            _stalker_job = _stalker_pool.submit(_scan_stalkers)
+        return _stalker_job
+
+
 @app.route("/api/stalkers")
 def api_stalkers():
     """Multi-location stalker ranking from GPS-correlated Kismet data."""
     try:
-        from multi_location_tracker import MultiLocationTracker
-        mlt = MultiLocationTracker(config_path=CONFIG_PATH)
-        mlt.scan_and_correlate(
-            whitelist_path=detector.config["paths"]["whitelist"]
-        )
         limit = int(request.args.get("limit", 20))
-        ranked = mlt.get_ranked_stalkers(limit=limit)
-        return jsonify({"stalkers": [r.to_dict() for r in ranked]})
+        scanned, ranked = _stalker_cache
+        if ranked is None or request.args.get("refresh") == "1":
+            ranked = _refresh_stalkers().result()
+        elif time.monotonic() - scanned >= STALKER_REFRESH_INTERVAL:
+            # Serve the current ranking; a later poll picks up the rescan
+            _refresh_stalkers()
+        return _json_response({"stalkers": ranked[:limit]})
     except Exception as e:
         return jsonify({"stalkers": [], "error": str(e)})
 
@@ -382,39 +613,70 @@ def api_add_checkpoint():
     if lat is None or lon is None:
         return jsonify({"error": "lat and lon required"}), 400
     try:
-        from multi_location_tracker import MultiLocationTracker
-        mlt = MultiLocationTracker(config_path=CONFIG_PATH)
-        cp = mlt.add_checkpoint(float(lat), float(lon), label)
+        cp = _stalker_pool.submit(_add_checkpoint, float(lat), float(lon), label).result()
         # Trigger map update on UI (via SSE soon)
         return jsonify({"ok": True, "checkpoint": cp.to_dict()})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# ─── System stats sampler ─────────────────────
+# Seconds between samples; /api/sys_stats serves the latest one
+SYS_SAMPLE_INTERVAL = 2
+_sys_snapshot: dict | None = None
+_sys_sampler_lock = threading.Lock()
+# CPU temperature sensors in order of preference (RPi, then x86)
+_TEMP_SENSORS = ("cpu_thermal", "coretemp")
+# The one this host has, resolved on the first sample; "" once known to have none
+_temp_sensor: str | None = None
+
+
+def _sample_sys() -> dict:
+    global _temp_sensor
+    cpu = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory().percent
+    disk = psutil.disk_usage("/").percent
+
+    # Temperature (RPi/Linux specific)
+    temp = None
+    if _temp_sensor != "" and hasattr(psutil, "sensors_temperatures"):
+        temps = psutil.sensors_temperatures()
+        if _temp_sensor is None:
+            _temp_sensor = next((k for k in _TEMP_SENSORS if k in temps), "")
+        if temps.get(_temp_sensor):
+            temp = temps[_temp_sensor][0].current
+
+    return {"cpu": cpu, "memory": memory, "disk": disk, "temp": temp}
+
+
+def _sys_sampler():
+    global _sys_snapshot
+    while True:
+        time.sleep(SYS_SAMPLE_INTERVAL)
+        try:
+            _sys_snapshot = _sample_sys()
+        except Exception:
+            pass  # keep serving the last good sample
+
+
+def _sys_stats() -> dict:
+    """Latest system sample; the first call samples inline and starts the sampler thread."""
+    global _sys_snapshot
+    if _sys_snapshot is None:
+        with _sys_sampler_lock:
+            if _sys_snapshot is None:
+                _sys_snapshot = _sample_sys()
+                threading.Thread(target=_sys_sampler, daemon=True, name="sys-stats").start()
+    return _sys_snapshot
+
+
 @app.route("/api/sys_stats")
 def api_sys_stats():
     """Return system health metrics (CPU, RAM, Disk, Temp)."""
     try:
-        cpu = psutil.cpu_percent(interval=None)
-        memory = psutil.virtual_memory().percent
-        disk = psutil.disk_usage("/").percent
-        
-        # Temperature (RPi/Linux specific)
-        temp = None
-        if hasattr(psutil, "sensors_temperatures"):
-            temps = psutil.sensors_temperatures()
-            if "cpu_thermal" in temps:
-                temp = temps["cpu_thermal"][0].current
-            elif "coretemp" in temps:
-                temp = temps["coretemp"][0].current
-        
-        return jsonify({
-            "cpu": cpu,
-            "memory": memory,
-            "disk": disk,
-            "temp": temp,
-            "platform": platform.system(),
-            "node": platform.node()
+        return jsonify(_sys_stats() | {
+            "platform": _PLATFORM_SYSTEM,
+            "node": _PLATFORM_NODE
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -449,4 +711,15 @@ if __name__ == "__main__":
 
     print("\n🛡  SentinelWatch Web Dashboard")
     print("   http://localhost:8888\n")
+    if os.environ.get("SW_PROD") == "1":
+        # Threaded worker, not gevent: gevent would turn the detector, scan pools and
+        # log watcher into greenlets whose blocking sqlite/JSON calls freeze every
+        # client. One worker only: the detector and the SSE fan-out live in that
+        # process. Each open SSE stream holds one of the threads.
+        try:
+            os.execvp("gunicorn", ["gunicorn", "-k", "gthread", "-w", "1",
+                                   "--threads", "64",
+                                   "-b", "0.0.0.0:8888", "web_ui:app"])
+        except OSError:
+            print("⚠  gunicorn not found — run: pip install gunicorn (using the dev server)")
     app.run(host="0.0.0.0", port=8888, debug=False, threaded=True)